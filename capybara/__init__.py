@@ -1,6 +1,13 @@
 from __future__ import absolute_import
 from contextlib import contextmanager
-
+import sys
+from threading import Lock, Thread, local
+from types import ModuleType
+
+from capybara.compat import Queue
+from capybara.exceptions import SessionsFailed
+from capybara.helpers import monotonic
+from capybara.retry_policy import FixedRetryPolicy
 from capybara.version import __version__
 
 
@@ -28,6 +35,29 @@ server_host = "127.0.0.1"
 server_port = None
 """ int, optional: The port bound by the default server. """
 
+server_routing = None
+"""
+str, optional: How a single server routes requests to the apps it serves, by ``"host"`` (e.g.,
+``app1.localhost``) or by ``"path"`` (e.g., ``/app1``). Defaults to None, meaning each app gets its
+own server. Sessions visit and report paths within the app, without the path prefix.
+
+Path routing passes the prefix to each app as ``SCRIPT_NAME``, so apps must build their URLs from
+it, as most WSGI frameworks do. Absolute links that ignore it, like a hardcoded ``/login``, lead out
+of the app. Use host routing for apps which emit such links.
+"""
+
+server_routing_domain = "localhost"
+"""
+str: The domain under which host routing serves each app on its own subdomain. Every subdomain must
+resolve to :data:`capybara.server_host`, as those of ``localhost`` do in most browsers.
+"""
+
+server_static_paths = {}
+""" Dict[str, str]: Directories whose files the server serves directly, keyed by URL prefix. """
+
+server_threads = 16
+""" int: The number of connections the "pooled" server handles at once. """
+
 automatic_label_click = False
 """ bool: Whether checkbox/radio actions will try to click the label of invisible elements. """
 
@@ -49,15 +79,27 @@ default_selector = "css"
 ignore_hidden_elements = True
 """ bool: Whether to ignore hidden elements on the page. """
 
+lazy_reset = False
+"""
+bool: Whether :func:`reset_sessions` resets sessions in the background, finishing each reset when
+the session is next used.
+"""
+
 match = "smart"
 """ str: The matching strategy to use. """
 
 raise_server_errors = True
 """ bool: Whether errors raised in the server should be raised in the tests. """
 
+retry_policy = FixedRetryPolicy()
+""" RetryPolicy: How long to wait between retries when waiting for asynchronous processes. """
+
 save_path = None
 """ str, optional: Where to put saved pages and screenshots. """
 
+synchronize_with_network = False
+""" bool: Whether to wait for requests in flight to finish before retrying a failed query. """
+
 visible_text_only = False
 """ bool: Whether to only consider visible text. """
 
@@ -76,16 +118,35 @@ session_name = "default"
 _session_pool = {}
 # Dict[str, Session]: A pool of `Session` objects, keyed by driver and app.
 
+_session_pool_lock = Lock()
+# Lock: Guards the creation of sessions in the pool.
+
+_context = local()
+# local: The settings overridden in the current thread, and the session last returned to it by
+#     `current_session`, after the driver, session name, app, and pool it was resolved for.
+
+_CONTEXT_LOCAL_SETTINGS = [
+    "_deadline", "current_driver", "default_max_wait_time", "retry_policy", "session_name"]
+# List[str]: The settings that the `using_*` context managers override for the current thread only.
+
+_deadline = None
+# float, optional: The monotonic time by which all waiting in the current `deadline` must finish.
+
 
-DSL_METHODS = ["using_session", "using_wait_time"]
+DSL_METHODS = ["deadline", "using_retry_policy", "using_session", "using_wait_time"]
 
 
-def register_server(name):
+def register_server(name, accepts_socket=False):
     """
     Register a server initialization function.
 
     Args:
         name (str): The name of the server.
+        accepts_socket (bool, optional): Whether the function accepts ``socket`` and ``ready``
+            keyword arguments: a listening socket already bound to the host and port, which it
+            should serve, and a function it should call once it is serving, passing a function
+            that makes it stop serving. Otherwise, Capybara polls the server until it responds,
+            and cannot stop it. Defaults to False.
 
     Returns:
         Callable[[Callable[[object, str, int], None]], None]: A decorator that takes a function
@@ -93,6 +154,7 @@ def register_server(name):
     """
 
     def register(init_func):
+        init_func.accepts_socket = accepts_socket
         servers[name] = init_func
 
     return register
@@ -116,52 +178,72 @@ def register_driver(name):
     return register
 
 
-def run_default_server(app, port):
-    servers["werkzeug"](app, port, server_host)
+def run_default_server(app, port, socket=None, ready=None):
+    servers["werkzeug"](app, port, server_host, socket=socket, ready=ready)
 
 
 def use_default_driver():
     """ Use the default driver as the current driver. """
-    global current_driver
-    current_driver = None
+    _set("current_driver", None)
 
 
 @contextmanager
 def using_driver(driver):
     """
-    Execute the wrapped code using a specific driver.
+    Execute the wrapped code using a specific driver. Only affects the current thread.
 
     Args:
         driver (str): The name of the desired driver.
     """
 
-    global current_driver
-
-    original_current_driver = current_driver
-    current_driver = driver
-    try:
+    with _override("current_driver", driver):
         yield
-    finally:
-        current_driver = original_current_driver
 
 
 @contextmanager
 def using_wait_time(seconds):
     """
-    Execute a context using a specific wait time.
+    Execute a context using a specific wait time. Only affects the current thread.
 
     Args:
         seconds (int | float): The new wait time.
     """
 
-    global default_max_wait_time
+    with _override("default_max_wait_time", seconds):
+        yield
 
-    original_max_wait_time = default_max_wait_time
-    default_max_wait_time = seconds
-    try:
+
+@contextmanager
+def using_retry_policy(policy):
+    """
+    Execute a context using a specific retry policy. Only affects the current thread.
+
+    Args:
+        policy (RetryPolicy): The new retry policy.
+    """
+
+    with _override("retry_policy", policy):
+        yield
+
+
+@contextmanager
+def deadline(seconds):
+    """
+    Execute a context in which no synchronized wait may continue past the given number of seconds
+    from now. Any such wait which would run past the deadline is cut short, and a synchronized
+    function that is still failing once it has passed raises :exc:`DeadlineExceeded`. Nested
+    deadlines can only shorten the outer deadline. Only affects the current thread.
+
+    Args:
+        seconds (int | float): The number of seconds until the deadline.
+    """
+
+    original_deadline = _get("_deadline")
+    new_deadline = monotonic() + seconds
+    if original_deadline is not None:
+        new_deadline = min(new_deadline, original_deadline)
+    with _override("_deadline", new_deadline):
         yield
-    finally:
-        default_max_wait_time = original_max_wait_time
 
 
 def current_session():
@@ -172,16 +254,33 @@ def current_session():
         Session: The :class:`Session` for the current driver and app.
     """
 
-    driver = current_driver or default_driver
+    driver = _get("current_driver") or default_driver
+    name = _get("session_name")
+
+    # Skip building the session key while the session's inputs are unchanged.
+    current = getattr(_context, "current_session", None)
+    if current is not None:
+        cached_driver, cached_name, cached_app, cached_pool, session = current
+        if (
+            driver == cached_driver and
+            name == cached_name and
+            app is cached_app and
+            _session_pool is cached_pool
+        ):
+            return session
 
     session_key = "{driver}:{session}:{app}".format(
-        driver=driver, session=session_name, app=str(id(app)))
-    session = _session_pool.get(session_key, None)
+        driver=driver, session=name, app=str(id(app)))
+
+    with _session_pool_lock:
+        session = _session_pool.get(session_key, None)
 
-    if session is None:
-        from capybara.session import Session
-        session = Session(driver, app)
-        _session_pool[session_key] = session
+        if session is None:
+            from capybara.session import Session
+            session = Session(driver, app)
+            _session_pool[session_key] = session
+
+    _context.current_session = (driver, name, app, _session_pool, session)
 
     return session
 
@@ -189,27 +288,99 @@ def current_session():
 @contextmanager
 def using_session(name):
     """
-    Execute the wrapped code using a specific session name.
+    Execute the wrapped code using a specific session name. Only affects the current thread, so
+    that threads can drive different sessions at once.
 
     Args:
         name (str): The name of the session to use.
     """
 
-    global session_name
-
-    previous_session_name = session_name
-    session_name = name
-    try:
+    with _override("session_name", name):
         yield
-    finally:
-        session_name = previous_session_name
+
+
+def run_sessions(functions, max_workers=None):
+    """
+    Runs each of the given functions against its own named session, several at once. Each
+    function is called with its session, which is also the current session while it runs, and
+    otherwise inherits the current driver, wait time, retry policy, and deadline.
+
+    Example::
+
+        def buy(session):
+            session.visit("/products/1")
+            session.click_button("Buy")
+
+        capybara.run_sessions({"user{0}".format(i): buy for i in range(20)}, max_workers=5)
+
+    Args:
+        functions (Dict[str, Callable[[Session], Any]]): The functions to run, keyed by the name of
+            the session against which to run them.
+        max_workers (int, optional): The maximum number of functions to run at once. Defaults to
+            running all of them at once.
+
+    Returns:
+        Dict[str, Any]: The value returned by each function, keyed by its session name.
+
+    Raises:
+        SessionsFailed: If any of the functions raised an error.
+    """
+
+    workers = min(max_workers or len(functions), len(functions))
+
+    settings = dict((name, _get(name)) for name in _CONTEXT_LOCAL_SETTINGS)
+    names = Queue()
+    for name in functions:
+        names.put(name)
+    for _ in range(workers):
+        names.put(None)
+
+    results = {}
+    errors = {}
+    sessions = []
+
+    def work():
+        _context.overrides = dict(settings)
+        while True:
+            name = names.get()
+            if name is None:
+                break
+            with using_session(name):
+                session = current_session()
+                sessions.append(session)
+                try:
+                    results[name] = functions[name](session)
+                except Exception as e:
+                    errors[name] = e
+
+    threads = [Thread(target=work) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Let the requests the functions left behind finish before returning their results.
+    for server in set(session.server for session in sessions if session.server):
+        server.wait_for_pending_requests()
+
+    if errors:
+        raise SessionsFailed(results, errors)
+
+    return results
 
 
 def reset_sessions():
-    """ Resets all sessions. """
+    """
+    Resets all sessions that have been used since they were last reset. If :data:`lazy_reset` is
+    set, the sessions are reset in the background.
+    """
 
-    for session in iter(_session_pool.values()):
-        session.reset()
+    for session in list(_session_pool.values()):
+        if session.dirty:
+            if lazy_reset:
+                session.reset_in_background()
+            else:
+                session.reset()
 
 
 reset = reset_sessions
@@ -256,13 +427,101 @@ def string(html):
     return Simple(html)
 
 
-@register_server("default")
-def init_default_server(app, port, host):
-    run_default_server(app, port)
+def _get(name):
+    overrides = getattr(_context, "overrides", None)
+    if overrides and name in overrides:
+        return overrides[name]
+    return globals()[name]
+
+
+def _set(name, value):
+    # Assignments within a `using_*` context only last as long as it, like the context's own value.
+    overrides = getattr(_context, "overrides", None)
+    if overrides and name in overrides:
+        overrides[name] = value
+    else:
+        globals()[name] = value
+
+
+@contextmanager
+def _override(name, value):
+    if not hasattr(_context, "overrides"):
+        _context.overrides = {}
+    overrides = _context.overrides
+
+    overridden = name in overrides
+    original_value = overrides.get(name)
+    overrides[name] = value
+    try:
+        yield
+    finally:
+        if overridden:
+            overrides[name] = original_value
+        else:
+            del overrides[name]
+
+
+class _ContextLocalModule(ModuleType):
+    """
+    The type of this module, which looks up context-local settings in the current thread before
+    falling back to their process-wide values.
+    """
+
+
+class _ContextLocalModuleProxy(_ContextLocalModule):
+    """
+    Stands in for this module in ``sys.modules`` where the type of a module can't be changed, as
+    in Python 2. Every attribute other than the context-local settings is read from and written to
+    the module itself.
+
+    Args:
+        module (ModuleType): The module to stand in for.
+    """
+
+    def __init__(self, module):
+        super(_ContextLocalModuleProxy, self).__init__(module.__name__, module.__doc__)
+        # Keep the module alive, as Python 2 clears the globals of modules it collects.
+        self.__dict__["_module"] = module
+
+    def __getattr__(self, name):
+        return getattr(self._module, name)
+
+    def __setattr__(self, name, value):
+        if name in _CONTEXT_LOCAL_SETTINGS:
+            super(_ContextLocalModuleProxy, self).__setattr__(name, value)
+        else:
+            setattr(self._module, name, value)
+
+    def __delattr__(self, name):
+        delattr(self._module, name)
+
 
+def _define_context_local_setting(name):
+    def fget(module):
+        return _get(name)
 
-@register_server("werkzeug")
-def init_werkzeug_server(app, port, host):
+    def fset(module, value):
+        _set(name, value)
+
+    setattr(_ContextLocalModule, name, property(fget, fset))
+
+
+for _name in _CONTEXT_LOCAL_SETTINGS:
+    _define_context_local_setting(_name)
+
+try:
+    sys.modules[__name__].__class__ = _ContextLocalModule
+except TypeError:
+    sys.modules[__name__] = _ContextLocalModuleProxy(sys.modules[__name__])
+
+
+@register_server("default", accepts_socket=True)
+def init_default_server(app, port, host, socket=None, ready=None):
+    run_default_server(app, port, socket=socket, ready=ready)
+
+
+@register_server("werkzeug", accepts_socket=True)
+def init_werkzeug_server(app, port, host, socket=None, ready=None):
     try:
         import werkzeug
     except ImportError:
@@ -277,12 +536,41 @@ def init_werkzeug_server(app, port, host):
     log = getLogger('werkzeug')
     log.disabled = True
 
-    server = make_server(host, port, app, threaded=True)
+    server = make_server(
+        host, port, app, threaded=True, fd=socket.fileno() if socket else None)
 
     # Inform Python that it shouldn't wait for request threads to terminate before
     # exiting. (They will still be appropriately terminated when the process exits.)
     server.daemon_threads = True
 
+    if ready:
+        ready(server.shutdown)
+
+    server.serve_forever()
+
+
+@register_server("pooled", accepts_socket=True)
+def init_pooled_server(app, port, host, socket=None, ready=None):
+    try:
+        import werkzeug
+    except ImportError:
+        raise ImportError(
+            'Capybara\'s pooled server is unable to load `werkzeug`, please install the package '
+            'and add `werkzeug` to your requirements.txt file.')
+
+    from capybara.werkzeug.server import PooledWSGIServer
+    from logging import getLogger
+
+    # Mute the server.
+    log = getLogger('werkzeug')
+    log.disabled = True
+
+    server = PooledWSGIServer(
+        host, port, app, threads=server_threads, fd=socket.fileno() if socket else None)
+
+    if ready:
+        ready(server.shutdown)
+
     server.serve_forever()
 
 
@@ -3,6 +3,8 @@ import sys
 PY2 = sys.version_info[0] == 2
 
 if PY2:
+    from httplib import HTTPConnection
+    from Queue import Queue
     from urllib import quote, unquote, urlencode
     from urllib2 import URLError, urlopen
     from urlparse import ParseResult, urlparse, parse_qsl
@@ -12,6 +14,8 @@ if PY2:
 
     cmp = cmp
 else:
+    from http.client import HTTPConnection
+    from queue import Queue
     from urllib.error import URLError
     from urllib.request import urlopen
     from urllib.parse import ParseResult, urlparse, parse_qsl, quote, unquote, urlencode
@@ -1,4 +1,7 @@
 from contextlib import contextmanager
+from time import sleep
+from xpath import dsl as x
+from xpath.renderer import to_xpath
 
 
 class Base(object):
@@ -9,6 +12,23 @@ class Base(object):
         """ bool: Whether this driver needs to communicate with a real HTTP server. """
         return False
 
+    @property
+    def is_static(self):
+        """
+        bool: Whether the page can only change through the driver's own actions, so that waiting
+        for it to change is pointless.
+        """
+
+        return False
+
+    def prepare(self):
+        """
+        Starts any slow setup the driver can do ahead of its first use, e.g., while the server for
+        its session boots.
+        """
+
+        pass
+
     @property
     def current_url(self):
         """ str: The current URL. """
@@ -107,6 +127,47 @@ class Base(object):
 
         raise NotImplementedError()
 
+    def window_metadata(self, handles):
+        """
+        Returns a snapshot of the title and URL of each of the given window handles. The current
+        window is restored afterwards.
+
+        Args:
+            handles (List[object]): The handles for the desired windows.
+
+        Returns:
+            Dict[object, Dict[str, str | bool]]: A dictionary of window handles to their
+                ``"title"``, ``"url"``, and whether their document has ``"loaded"``.
+                Windows which close while the snapshot is taken are omitted.
+        """
+
+        original_handle = current_handle = self.current_window_handle
+        metadata = {}
+        try:
+            for handle in handles:
+                try:
+                    if handle != current_handle:
+                        self.switch_to_window(handle)
+                        current_handle = handle
+                    metadata[handle] = self._current_window_metadata()
+                except self.no_such_window_error:
+                    pass
+        finally:
+            if current_handle != original_handle:
+                self.switch_to_window(original_handle)
+        return metadata
+
+    def _current_window_metadata(self):
+        """
+        A private method for describing the current window for :meth:`window_metadata`.
+
+        Returns:
+            Dict[str, str | bool]: The ``"title"``, ``"url"``, and ``"loaded"`` state of the
+                current window.
+        """
+
+        return {"title": self.title, "url": self.current_url, "loaded": True}
+
     @property
     def no_such_window_error(self):
         """ Exception: The error that is thrown when a window cannot be found. """
@@ -211,6 +272,23 @@ class Base(object):
 
         raise NotImplementedError()
 
+    @property
+    def pending_requests(self):
+        """ int: The number of requests the page has in flight, as far as the driver can tell. """
+        return 0
+
+    def wait_for_change(self, delay, timeout):
+        """
+        Waits before a synchronized function is retried. Drivers which can tell when the page
+        changes may wait for that instead.
+
+        Args:
+            delay (float): The number of seconds the retry policy asks to wait.
+            timeout (float): The number of seconds left before the function gives up.
+        """
+
+        sleep(min(delay, timeout))
+
     @property
     def invalid_element_errors(self):
         """ Tuple[Exception]: A tuple of exceptions that indicate an element is invalid. """
@@ -245,3 +323,59 @@ class Base(object):
         """
 
         raise NotImplementedError()
+
+    @property
+    def _stops_finding_early(self):
+        """
+        bool: Whether :meth:`_find_limited_css` and :meth:`_find_limited_xpath` return at most the
+        given number of nodes, rather than every matching node.
+        """
+        return False
+
+    def _find_limited_css(self, query, limit):
+        """
+        A private method for finding at most the given number of nodes matching a given CSS query.
+        Drivers that can't stop early may return every matching node.
+
+        Args:
+            query (str): The CSS query to match.
+            limit (int): The maximum number of nodes to find.
+
+        Returns:
+            List[driver.Node]: The first matching nodes found by the driver, or all of them.
+        """
+
+        return list(self._find_css(query))
+
+    def _find_limited_xpath(self, query, limit):
+        """
+        A private method for finding at most the given number of nodes matching a given XPath
+        query. Drivers that can't stop early may return every matching node.
+
+        Args:
+            query (str): The XPath query to match.
+            limit (int): The maximum number of nodes to find.
+
+        Returns:
+            List[driver.Node]: The first matching nodes found by the driver, or all of them.
+        """
+
+        return list(self._find_xpath(query))
+
+    def _find_relocated_css(self, relocator, query):
+        """
+        A private method for finding the node which the given relocator finds again, as long as it
+        still matches the given CSS query.
+
+        Args:
+            relocator (str): An XPath expression which finds the node from the document.
+            query (str): The CSS query the node must still match.
+
+        Returns:
+            List[driver.Node]: The relocated node, if it still matches the query.
+        """
+
+        # Only the relocated node can be in both the query's and the relocator's node-sets.
+        return self._find_limited_xpath(
+            "({query})[count(. | {relocator}) = count({relocator})]".format(
+                query=to_xpath(x.css(query)), relocator=relocator), 1)
@@ -1,3 +1,7 @@
+from xpath import dsl as x
+from xpath.renderer import to_xpath
+
+
 class Node(object):
     """
     The base class for nodes returned by a driver.
@@ -65,6 +69,15 @@ class Node(object):
         """ str: An XPath expression describing where on the page the node can be found. """
         raise NotImplementedError()
 
+    @property
+    def relocator(self):
+        """
+        str, optional: An XPath expression which cheaply finds this node again from the document,
+        if the driver knows one.
+        """
+
+        return None
+
     @property
     def all_text(self):
         """ str: All of the text of the node. """
@@ -173,3 +186,60 @@ class Node(object):
     def readonly(self):
         """ bool: Whether the node is read-only. """
         raise NotImplementedError()
+
+    @property
+    def _stops_finding_early(self):
+        """
+        bool: Whether :meth:`_find_limited_css` and :meth:`_find_limited_xpath` return at most the
+        given number of descendant nodes, rather than every matching node.
+        """
+        return False
+
+    def _find_limited_css(self, query, limit):
+        """
+        A private method for finding at most the given number of descendant nodes matching a
+        given CSS query. Drivers that can't stop early may return every matching node.
+
+        Args:
+            query (str): The CSS query to match.
+            limit (int): The maximum number of nodes to find.
+
+        Returns:
+            List[driver.Node]: The first matching nodes found by the driver, or all of them.
+        """
+
+        return list(self._find_css(query))
+
+    def _find_limited_xpath(self, query, limit):
+        """
+        A private method for finding at most the given number of nodes matching a given XPath
+        query relative to this node. Drivers that can't stop early may return every matching
+        node.
+
+        Args:
+            query (str): The XPath query to match.
+            limit (int): The maximum number of nodes to find.
+
+        Returns:
+            List[driver.Node]: The first matching nodes found by the driver, or all of them.
+        """
+
+        return list(self._find_xpath(query))
+
+    def _find_relocated_css(self, relocator, query):
+        """
+        A private method for finding the node which the given relocator finds again, as long as it
+        still matches the given CSS query relative to this node.
+
+        Args:
+            relocator (str): An XPath expression which finds the node from the document.
+            query (str): The CSS query the node must still match.
+
+        Returns:
+            List[driver.Node]: The relocated node, if it still matches the query.
+        """
+
+        # Only the relocated node can be in both the query's and the relocator's node-sets.
+        return self._find_limited_xpath(
+            "({query})[count(. | {relocator}) = count({relocator})]".format(
+                query=to_xpath(x.css(query)), relocator=relocator), 1)
@@ -3,7 +3,7 @@ import sys
 
 import capybara
 from capybara import DSL_METHODS as PACKAGE_METHODS
-from capybara.session import DSL_METHODS as SESSION_METHODS, Session
+from capybara.session import DSL_METHODS as SESSION_METHODS, Session, _NODE_METHODS
 
 
 __all__ = ["page"] + SESSION_METHODS + PACKAGE_METHODS
@@ -38,7 +38,17 @@ def _define_package_method(name):
 def _define_session_method(name):
     @wraps(getattr(Session, name))
     def func(*args, **kwargs):
-        return getattr(page, name)(*args, **kwargs)
+        return getattr(capybara.current_session(), name)(*args, **kwargs)
+
+    setattr(DSLMixin, name, func)
+    setattr(_module, name, func)
+
+
+def _define_node_method(name):
+    # Call the current scope directly, rather than through the session method that delegates to it.
+    @wraps(getattr(Session, name))
+    def func(*args, **kwargs):
+        return getattr(capybara.current_session().current_scope, name)(*args, **kwargs)
 
     setattr(DSLMixin, name, func)
     setattr(_module, name, func)
@@ -49,4 +59,7 @@ for _method in PACKAGE_METHODS:
 
 
 for _method in SESSION_METHODS:
-    _define_session_method(_method)
+    if _method in _NODE_METHODS:
+        _define_node_method(_method)
+    else:
+        _define_session_method(_method)
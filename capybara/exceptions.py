@@ -6,6 +6,10 @@ class FrozenInTime(CapybaraError):
     pass
 
 
+class DeadlineExceeded(CapybaraError):
+    pass
+
+
 class ElementNotFound(CapybaraError):
     pass
 
@@ -40,3 +44,21 @@ class WindowError(CapybaraError):
 
 class ReadOnlyElementError(CapybaraError):
     pass
+
+
+class SessionsFailed(CapybaraError):
+    """
+    Raised when any of the functions run by :func:`capybara.run_sessions` raised an error.
+
+    Args:
+        results (Dict[str, Any]): The value returned by each function that succeeded.
+        errors (Dict[str, Exception]): The error raised by each function that failed.
+    """
+
+    def __init__(self, results, errors):
+        super(SessionsFailed, self).__init__("{0} of {1} sessions failed: {2}".format(
+            len(errors),
+            len(results) + len(errors),
+            ", ".join("{0} ({1!r})".format(name, error) for name, error in sorted(errors.items()))))
+        self.results = results
+        self.errors = errors
@@ -1,10 +1,50 @@
 import re
+from threading import Thread
 import time
 
+import capybara
 from capybara.compat import PY2, str_
 from capybara.utils import decode_bytes, isbytes, isregex, isstring, encode_string
 
 
+class BackgroundCall(object):
+    """
+    Calls the given function on a background thread, so that its result can be collected later.
+
+    Args:
+        func (Callable[[], object]): The function to call.
+    """
+
+    def __init__(self, func):
+        self._result = None
+        self._error = None
+        self._thread = Thread(target=self._run, args=(func,))
+        self._thread.daemon = True
+        self._thread.start()
+
+    def join(self):
+        """
+        Waits for the call to finish.
+
+        Returns:
+            object: The result of the call.
+
+        Raises:
+            Exception: The error raised by the call, if any.
+        """
+
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+    def _run(self, func):
+        try:
+            self._result = func()
+        except Exception as e:
+            self._error = e
+
+
 def declension(singular, plural, count):
     """
     Returns the appropriate word variation for the given quantity.
@@ -180,17 +220,35 @@ class Timer:
     """
     Args:
         expire_in (int): The number of seconds from now in which this timer should expire.
+        clip_to_deadline (bool, optional): Whether to shorten the timer to fit within the current
+            :func:`capybara.deadline`, if any. Defaults to False.
     """
 
-    def __init__(self, expire_in):
+    def __init__(self, expire_in, clip_to_deadline=False):
         self._start = monotonic()
         self._expire_in = expire_in
+        self._clipped = False
+
+        deadline = capybara._deadline if clip_to_deadline else None
+        if deadline is not None and deadline - self._start < expire_in:
+            self._expire_in = max(deadline - self._start, 0)
+            self._clipped = True
+
+    @property
+    def clipped(self):
+        """ bool: Whether this timer was shortened to fit within the current deadline. """
+        return self._clipped
 
     @property
     def expired(self):
         """ bool: Whether this timer has expired. """
         return monotonic() - self._start >= self._expire_in
 
+    @property
+    def remaining(self):
+        """ float: The number of seconds until this timer expires. """
+        return max(self._expire_in - (monotonic() - self._start), 0)
+
     @property
     def stalled(self):
         """ bool: Whether this timer appears to have stalled. """
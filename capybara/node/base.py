@@ -1,8 +1,7 @@
 from functools import wraps
-from time import sleep
 
 import capybara
-from capybara.exceptions import ElementNotFound, FrozenInTime, ScopeError
+from capybara.exceptions import DeadlineExceeded, ElementNotFound, FrozenInTime, ScopeError
 from capybara.helpers import Timer
 from capybara.node.actions import ActionsMixin
 from capybara.node.finders import FindersMixin
@@ -92,7 +91,7 @@ class Base(FindersMixin, ActionsMixin, MatchersMixin, object):
         """ str: Only the visible text of the node. """
         raise NotImplementedError()
 
-    def synchronize(self, func=None, wait=None, errors=()):
+    def synchronize(self, func=None, wait=None, errors=(), retry_policy=None):
         """
         This method is Capybara's primary defense against asynchronicity problems. It works by
         attempting to run a given decorated function until it succeeds. The exact behavior of this
@@ -100,9 +99,9 @@ class Base(FindersMixin, ActionsMixin, MatchersMixin, object):
         raised from the decorated function, instead of bubbling up, are caught, and the function is
         re-run.
 
-        Certain drivers have no support for asynchronous processes. These drivers run the function,
-        and any error raised bubbles up immediately. This allows faster turn around in the case
-        where an expectation fails.
+        Certain drivers have no support for asynchronous processes, as indicated by
+        ``driver.is_static``. These drivers run the function, and any error raised bubbles up
+        immediately. This allows faster turn around in the case where an expectation fails.
 
         Only exceptions that are :exc:`ElementNotFound` or any subclass thereof cause the block to
         be rerun. Drivers may specify additional exceptions which also cause reruns. This usually
@@ -113,18 +112,25 @@ class Base(FindersMixin, ActionsMixin, MatchersMixin, object):
         amount of time passes. The amount of time defaults to :data:`capybara.default_max_wait_time`
         and can be overridden through the ``wait`` argument. This time is compared with the system
         time to see how much time has passed. If the return value of ``time.time()`` is stubbed
-        out, Capybara will raise :exc:`FrozenInTime`.
+        out, Capybara will raise :exc:`FrozenInTime`. How long to wait between retries is decided by
+        :data:`capybara.retry_policy`, which can be overridden through the ``retry_policy``
+        argument. If :data:`capybara.synchronize_with_network` is set and requests are in flight,
+        the function is instead retried as soon as they finish.
 
         Args:
             func (Callable, optional): The function to decorate.
             wait (int, optional): Number of seconds to retry this function.
             errors (Tuple[Type[Exception]], optional): Exception types that cause the function to be
                 rerun. Defaults to ``driver.invalid_element_errors`` + :exc:`ElementNotFound`.
+            retry_policy (RetryPolicy, optional): The policy deciding how long to wait between
+                retries. Defaults to :data:`capybara.retry_policy`.
 
         Returns:
             Callable: The decorated function, or a decorator function.
 
         Raises:
+            DeadlineExceeded: If the function still fails when the current
+                :func:`capybara.deadline` runs out.
             FrozenInTime: If the return value of ``time.time()`` appears stuck.
         """
 
@@ -132,6 +138,7 @@ class Base(FindersMixin, ActionsMixin, MatchersMixin, object):
             @wraps(func)
             def outer(*args, **kwargs):
                 seconds = wait if wait is not None else capybara.default_max_wait_time
+                policy = retry_policy or capybara.retry_policy
 
                 def inner():
                     return func(*args, **kwargs)
@@ -139,7 +146,8 @@ class Base(FindersMixin, ActionsMixin, MatchersMixin, object):
                 if self.session.synchronized:
                     return inner()
                 else:
-                    timer = Timer(seconds)
+                    timer = Timer(seconds, clip_to_deadline=True)
+                    retries = 0
                     self.session.synchronized = True
                     try:
                         while True:
@@ -150,10 +158,21 @@ class Base(FindersMixin, ActionsMixin, MatchersMixin, object):
 
                                 if not self._should_catch_error(e, errors):
                                     raise
+                                if self.session.driver.is_static:
+                                    raise
                                 if timer.expired:
+                                    if timer.clipped:
+                                        raise DeadlineExceeded(
+                                            "ran out of time before the deadline: {}".format(e))
                                     raise
 
-                                sleep(0.05)
+                                retries += 1
+                                if capybara.synchronize_with_network and self.session._network_busy:
+                                    # Retry as soon as the app has finished responding.
+                                    self.session._wait_for_network_idle(0, timer, policy)
+                                else:
+                                    self.session.driver.wait_for_change(
+                                        policy.delay(retries), timer.remaining)
 
                                 if timer.stalled:
                                     raise FrozenInTime(
@@ -164,6 +183,7 @@ class Base(FindersMixin, ActionsMixin, MatchersMixin, object):
                                     self.reload()
                     finally:
                         self.session.synchronized = False
+                        policy.record(retries)
 
             return outer
 
@@ -198,6 +218,19 @@ class Base(FindersMixin, ActionsMixin, MatchersMixin, object):
     def _find_xpath(self, xpath):
         return self.base._find_xpath(xpath)
 
+    @property
+    def _stops_finding_early(self):
+        return self.base._stops_finding_early
+
+    def _find_limited_css(self, css, limit):
+        return self.base._find_limited_css(css, limit)
+
+    def _find_limited_xpath(self, xpath, limit):
+        return self.base._find_limited_xpath(xpath, limit)
+
+    def _find_relocated_css(self, relocator, css):
+        return self.base._find_relocated_css(relocator, css)
+
 
 def synchronize(func):
     """ Decorator for :meth:`synchronize`. """
@@ -2,6 +2,7 @@ from warnings import warn
 
 import capybara
 from capybara.node.base import Base, synchronize
+from capybara.queries.selector_query import SelectorQuery
 
 
 class Element(Base):
@@ -66,13 +67,59 @@ class Element(Base):
 
     def reload(self):
         if self.allow_reload:
+            errors = self.session.driver.invalid_element_errors
+            # Drivers which can't tell when the scope is stale must always reload it first.
+            scope_is_stale = not errors
+            if errors:
+                try:
+                    if self._relocate(self.query_scope):
+                        return self
+                except errors:
+                    scope_is_stale = True
+
             query_scope = self.query_scope.reload()
-            reloaded = query_scope.find_first(
-                self.query.name, self.query.locator, **self.query.kwargs)
-            if reloaded:
-                self.base = reloaded.base
+            if not (scope_is_stale and self._relocate(query_scope)):
+                reloaded = query_scope.find_first(
+                    self.query.name, self.query.locator, **self.query.kwargs)
+                if reloaded:
+                    self.base = reloaded.base
         return self
 
+    def _relocate(self, query_scope):
+        """
+        Tries to find the element again with the relocator recorded by the driver when it was
+        found. The node found is only kept if the query still matches it within the given scope,
+        which takes a single lookup instead of re-running the query and its filters on every match.
+
+        Args:
+            query_scope (node.Base): The node relative to which the query was resolved.
+
+        Returns:
+            bool: Whether the element was found and still matches the query.
+        """
+
+        relocator = self.base.relocator
+        # Ancestor and sibling queries aren't resolved relative to their scope.
+        if relocator is None or type(self.query) is not SelectorQuery:
+            return False
+
+        if self.query.selector.format == "css":
+            bases = query_scope._find_relocated_css(relocator, self.query.css())
+        else:
+            # Only the relocated node can be in both the query's and the relocator's node-sets.
+            bases = query_scope._find_limited_xpath(
+                "({query})[count(. | {relocator}) = count({relocator})]".format(
+                    query=self.query.xpath(), relocator=relocator), 1)
+        if not bases:
+            return False
+
+        element = Element(self.session, bases[0], self.query_scope, self.query)
+        if not self.query.matches_filters(element):
+            return False
+
+        self.base = element.base
+        return True
+
     @property
     @synchronize
     def tag_name(self):
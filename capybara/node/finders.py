@@ -194,18 +194,7 @@ class FindersMixin(object):
             ExpectationNotMet: The matched results did not meet the expected criteria.
         """
 
-        query = SelectorQuery(*args, **kwargs)
-
-        @self.synchronize(wait=query.wait)
-        def find_all():
-            result = query.resolve_for(self)
-
-            if not result.matches_count:
-                raise ExpectationNotMet(result.failure_message)
-
-            return result
-
-        return find_all()
+        return self._synchronized_resolve_all(SelectorQuery(*args, **kwargs))
 
     def find_first(self, *args, **kwargs):
         """
@@ -227,26 +216,48 @@ class FindersMixin(object):
         if capybara.wait_on_first_by_default:
             kwargs.setdefault("minimum", 1)
 
+        query = SelectorQuery(*args, **kwargs)
+
+        # Only as many elements are needed as it takes to check the query's count options.
+        limit = max(1, query._limit or 1)
+
+        @self.synchronize(wait=query.wait)
+        def find_first():
+            result = self._resolve_limited(query, limit=limit)
+
+            if not result.matches_count:
+                raise ExpectationNotMet(result.failure_message)
+
+            return result[0] if result else None
+
         try:
-            result = self.find_all(*args, **kwargs)
-            return result[0] if len(result) > 0 else None
+            return find_first()
         except ExpectationNotMet:
             return None
 
     def _synchronized_resolve(self, query):
+        # Two elements are enough to tell whether the match is ambiguous.
+        limit = 2 if query.match in ["one", "smart"] else 1
+
         @self.synchronize(wait=query.wait)
         def resolve():
+            exact = None
             if query.match in ["prefer_exact", "smart"]:
-                result = query.resolve_for(self, True)
-                if len(result) == 0 and not query.exact:
-                    result = query.resolve_for(self, False)
+                exact = True
+                result = self._resolve_limited(query, exact, limit)
+                if not result and not query.exact:
+                    exact = False
+                    result = self._resolve_limited(query, exact, limit)
             else:
-                result = query.resolve_for(self)
+                result = self._resolve_limited(query, exact, limit)
 
-            if query.match in ["one", "smart"] and len(result) > 1:
+            if query.match in ["one", "smart"] and result._cache_at_least(2):
+                if self._stops_finding_early and len(result._elements) == limit:
+                    # Count every match for the error message.
+                    result = query.resolve_for(self, exact)
                 raise Ambiguous("Ambiguous match, found {count} elements matching {query}".format(
                     count=len(result), query=query.description))
-            if len(result) == 0:
+            if not result:
                 raise ElementNotFound("Unable to find {0}".format(query.description))
 
             element = result[0]
@@ -254,3 +265,28 @@ class FindersMixin(object):
             return element
 
         return resolve()
+
+    def _synchronized_resolve_all(self, query):
+        @self.synchronize(wait=query.wait)
+        def resolve_all():
+            result = query.resolve_for(self)
+
+            if not result.matches_count:
+                raise ExpectationNotMet(result.failure_message)
+
+            return result
+
+        return resolve_all()
+
+    def _resolve_limited(self, query, exact=None, limit=1):
+        result = query.resolve_for(self, exact, limit=limit)
+
+        # A driver which stopped early may have left out elements matching the filters.
+        if (
+            self._stops_finding_early and
+            len(result._elements) == limit and
+            not result._cache_at_least(limit)
+        ):
+            result = query.resolve_for(self, exact)
+
+        return result
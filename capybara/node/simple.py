@@ -154,6 +154,14 @@ class Simple(FindersMixin, MatchersMixin, DocumentMatchersMixin, object):
         xpath = to_xpath(x.css(css))
         return self._find_xpath(xpath)
 
+    _stops_finding_early = False
+
+    def _find_limited_xpath(self, xpath, limit):
+        return self._find_xpath(xpath)
+
+    def _find_limited_css(self, css, limit):
+        return self._find_css(css)
+
 
 def _get_option_value(option):
     return option.get("value") or inner_content(option)
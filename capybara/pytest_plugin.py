@@ -2,9 +2,20 @@ import pytest
 
 import capybara
 import capybara.dsl
+from capybara.server import Server
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("capybara")
+    group.addoption(
+        "--capybara-server-stats", metavar="SECONDS", type=float, default=None,
+        help="attach the server's request stats to reports of tests slower than SECONDS.")
 
 
 def pytest_runtest_setup(item):
+    for server in Server.registry.servers:
+        server.reset_stats()
+
     if item.get_marker("js"):
         capybara.current_driver = capybara.javascript_driver
 
@@ -14,6 +25,42 @@ def pytest_runtest_setup(item):
         capybara.current_driver = driver.args[0]
 
 
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    deadline = item.get_marker("deadline")
+    if deadline:
+        assert len(deadline.args) == 1, "exactly one deadline must be specified"
+        with capybara.deadline(deadline.args[0]):
+            yield
+    else:
+        yield
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    threshold = item.config.getoption("capybara_server_stats")
+    if call.when == "call" and threshold is not None and call.stop - call.start >= threshold:
+        report = outcome.get_result()
+        lines = [
+            _format_stats(request, stats)
+            for server in Server.registry.servers
+            for request, stats in sorted(server.stats().items())]
+        if lines:
+            report.sections.append(("Captured server stats", "\n".join(lines)))
+
+
+def _format_stats(request, stats):
+    return "{0}: {1} requests, mean {2:.1f} ms, max {3:.1f} ms, {4} bytes, statuses {5}".format(
+        request,
+        stats["count"],
+        stats["seconds"] / stats["count"] * 1000,
+        stats["max_seconds"] * 1000,
+        stats["size"],
+        ", ".join("{0} x{1}".format(status, count)
+                  for status, count in sorted(stats["statuses"].items())))
+
+
 def pytest_runtest_teardown():
     capybara.reset_sessions()
     capybara.use_default_driver()
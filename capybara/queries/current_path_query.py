@@ -38,11 +38,12 @@ class CurrentPathQuery(object):
             self.actual_path = session.current_url
         else:
             result = urlparse(session.current_url)
+            path = session._app_path(result)
 
             if self.only_path:
-                self.actual_path = result.path
+                self.actual_path = path
             else:
-                request_uri = result.path
+                request_uri = path
                 if result.query:
                     request_uri += "?{0}".format(result.query)
 
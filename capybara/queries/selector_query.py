@@ -177,13 +177,17 @@ class SelectorQuery(BaseQuery):
         else:
             return str_(self.expression)
 
-    def resolve_for(self, node, exact=None):
+    def resolve_for(self, node, exact=None, limit=None):
         """
         Resolves this query relative to the given node.
 
         Args:
             node (node.Base): The node relative to which this query should be resolved.
             exact (bool, optional): Whether to exactly match text.
+            limit (int, optional): The number of elements the caller expects to need. If given,
+                drivers which can stop early only find this many elements, so the result may be
+                missing elements that match the filters. Callers are responsible for resolving the
+                query again without a limit if they need more.
 
         Returns:
             list[Element]: A list of elements matched by this query.
@@ -196,9 +200,16 @@ class SelectorQuery(BaseQuery):
         @node.synchronize
         def resolve():
             if self.selector.format == "css":
-                children = node._find_css(self.css())
+                query = self.css()
+                find_all, find_limited = node._find_css, node._find_limited_css
             else:
-                children = node._find_xpath(self.xpath(exact))
+                query = self.xpath(exact)
+                find_all, find_limited = node._find_xpath, node._find_limited_xpath
+
+            if limit is None:
+                children = find_all(query)
+            else:
+                children = find_limited(query, limit)
 
             def wrap(child):
                 if isinstance(child, Node):
@@ -268,6 +279,20 @@ class SelectorQuery(BaseQuery):
 
         return True
 
+    @property
+    def _limit(self):
+        """ int | None: The number of elements needed to check this query's count options. """
+
+        if self.options["count"] is not None:
+            return int(self.options["count"]) + 1
+        if self.options["maximum"] is not None:
+            return int(self.options["maximum"]) + 1
+        if self.options["between"] is not None:
+            return self.options["between"][-1] + 1
+        if self.options["minimum"] is not None:
+            return int(self.options["minimum"])
+        return None
+
     def _apply_expression_filters(self, expr):
         def apply_filter(memo, item):
             name, ef = item
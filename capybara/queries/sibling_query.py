@@ -6,7 +6,7 @@ from capybara.result import Result
 
 
 class SiblingQuery(SelectorQuery):
-    def resolve_for(self, node, exact=None):
+    def resolve_for(self, node, exact=None, limit=None):
         setattr(self, "_resolved_node", node)
 
         @node.synchronize()
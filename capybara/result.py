@@ -12,7 +12,7 @@ class Result(object):
     ``__getitem__`` and offers the following container methods through delegation:
 
     * ``__len__``
-    * ``__nonzero__`` (Python 2)
+    * ``__bool__`` (``__nonzero__`` in Python 2)
 
     Args:
         elements (List[Element]): The initial list of elements found by the query.
@@ -43,6 +43,8 @@ class Result(object):
     def __nonzero__(self):
         return self._cache_at_least(1)
 
+    __bool__ = __nonzero__
+
     def __iter__(self):
         for node in self._result_cache:
             yield node
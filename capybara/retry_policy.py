@@ -0,0 +1,112 @@
+from collections import defaultdict
+from random import uniform
+from threading import Lock
+
+
+class RetryPolicy(object):
+    """
+    The base class for policies deciding how long :meth:`node.Base.synchronize` waits before
+    retrying a function. Policies also count how many times each synchronized call was retried, to
+    help with tuning them.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._retry_counts = defaultdict(int)
+
+    def delay(self, retry):
+        """
+        Returns the number of seconds to wait before the given retry.
+
+        Args:
+            retry (int): The number of the retry, starting from 1.
+
+        Returns:
+            float: The number of seconds to wait.
+        """
+
+        raise NotImplementedError()
+
+    @property
+    def retry_counts(self):
+        """
+        Dict[int, int]: The number of synchronized calls, keyed by how often each was retried.
+        """
+        with self._lock:
+            return dict(self._retry_counts)
+
+    def record(self, retries):
+        """
+        Records that a synchronized call finished after the given number of retries.
+
+        Args:
+            retries (int): The number of times the call was retried.
+        """
+
+        with self._lock:
+            self._retry_counts[retries] += 1
+
+    def clear_retry_counts(self):
+        """ Forgets all recorded retry counts. """
+        with self._lock:
+            self._retry_counts.clear()
+
+
+class FixedRetryPolicy(RetryPolicy):
+    """
+    Waits the same number of seconds before every retry.
+
+    Args:
+        interval (float, optional): The number of seconds to wait. Defaults to 0.05.
+    """
+
+    def __init__(self, interval=0.05):
+        super(FixedRetryPolicy, self).__init__()
+        self.interval = interval
+
+    def delay(self, retry):
+        return self.interval
+
+
+class ExponentialRetryPolicy(RetryPolicy):
+    """
+    Waits exponentially longer before each retry, up to a maximum.
+
+    Args:
+        initial (float, optional): The number of seconds to wait before the first retry. Defaults
+            to 0.05.
+        factor (float, optional): The factor by which the wait grows with each retry. Defaults to 2.
+        maximum (float, optional): The maximum number of seconds to wait. Defaults to 1.
+    """
+
+    def __init__(self, initial=0.05, factor=2, maximum=1):
+        super(ExponentialRetryPolicy, self).__init__()
+        self.initial = initial
+        self.factor = factor
+        self.maximum = maximum
+
+    def delay(self, retry):
+        # Stop growing once the maximum is reached, to avoid overflowing on very long waits.
+        delay = self.initial
+        for _ in range(retry - 1):
+            if delay >= self.maximum:
+                break
+            delay *= self.factor
+        return min(delay, self.maximum)
+
+
+class JitteredRetryPolicy(ExponentialRetryPolicy):
+    """
+    Waits exponentially longer before each retry, up to a maximum, randomly shortening each wait
+    by up to half so that concurrent sessions don't retry in lockstep.
+
+    Args:
+        initial (float, optional): The number of seconds to wait before the first retry. Defaults
+            to 0.05.
+        factor (float, optional): The factor by which the wait grows with each retry. Defaults to 2.
+        maximum (float, optional): The maximum number of seconds to wait. Defaults to 1.
+    """
+
+    def delay(self, retry):
+        delay = super(JitteredRetryPolicy, self).delay(retry)
+        return uniform(delay / 2, delay)
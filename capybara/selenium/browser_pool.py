@@ -0,0 +1,216 @@
+import atexit
+from selenium.common.exceptions import WebDriverException
+from threading import Condition, Thread
+
+from capybara.helpers import monotonic
+
+
+class BrowserPool(object):
+    """
+    A pool of warm browsers shared by Selenium drivers.
+
+    Browsers are checked out by a driver when it first needs one and checked back in when the
+    driver is reset, so that sessions can reuse a browser instead of launching their own. Drivers
+    sharing a pool should launch equivalent browsers.
+
+    Args:
+        min_size (int, optional): The number of idle browsers to keep launched in the background.
+            Defaults to 0.
+        max_size (int, optional): The maximum number of browsers, idle or checked out, to have
+            launched at once. Checkouts beyond this wait for a browser to be checked in. Defaults
+            to None, meaning no limit.
+        max_uses (int, optional): The number of checkouts after which a browser is quit and
+            replaced, to bound its memory growth. Defaults to None, meaning no limit.
+        checkout_timeout (int | float, optional): The number of seconds to wait for a browser to
+            be checked in when the pool is full. Defaults to 60.
+    """
+
+    def __init__(self, min_size=0, max_size=None, max_uses=None, checkout_timeout=60):
+        assert max_size is None or max_size >= max(min_size, 1), \
+            "max_size should be at least 1 and no less than min_size"
+
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_uses = max_uses
+        self.checkout_timeout = checkout_timeout
+        self._condition = Condition()
+        self._idle = []
+        self._uses = {}
+        self._launching = 0
+        self._launch = None
+        self._closed = False
+        atexit.register(self._quit_at_exit)
+
+    @property
+    def size(self):
+        """ int: The number of browsers launched, or being launched, by the pool. """
+        with self._condition:
+            return len(self._uses) + self._launching
+
+    def checkout(self, launch):
+        """
+        Returns a healthy browser from the pool, launching one if none is idle and the pool has
+        room for it.
+
+        Args:
+            launch (Callable[[], WebDriver]): A function for launching a new browser.
+
+        Returns:
+            WebDriver: The checked-out browser.
+
+        Raises:
+            RuntimeError: If the pool stays full for longer than its checkout timeout.
+        """
+
+        start = monotonic()
+        while True:
+            with self._condition:
+                self._launch = launch
+                while not self._idle and not self._has_room():
+                    remaining = self.checkout_timeout - (monotonic() - start)
+                    if remaining <= 0:
+                        raise RuntimeError(
+                            "Timed out after {0} seconds waiting for one of the pool's {1} "
+                            "browsers to be checked in. Reset the sessions using them, or raise "
+                            "the pool's max_size.".format(self.checkout_timeout, self.max_size))
+                    self._condition.wait(remaining)
+
+                if not self._idle:
+                    self._launching += 1
+                    break
+                browser = self._idle.pop()
+
+            # Check the browser without holding the lock, as it takes a round trip to the browser.
+            if self._healthy(browser):
+                with self._condition:
+                    self._uses[browser] += 1
+                    self._prelaunch()
+                return browser
+            self.discard(browser)
+
+        browser = self._launch_browser(launch)
+        with self._condition:
+            self._launching -= 1
+            self._uses[browser] = 1
+            self._prelaunch()
+        return browser
+
+    def checkin(self, browser):
+        """
+        Returns the given browser to the pool. It should already have been reset.
+
+        Args:
+            browser (WebDriver): The browser to check in.
+        """
+
+        with self._condition:
+            if browser not in self._uses:
+                return
+            retire = self._closed or (
+                self.max_uses is not None and self._uses[browser] >= self.max_uses)
+            if retire:
+                del self._uses[browser]
+                self._prelaunch()
+            else:
+                self._idle.append(browser)
+            self._condition.notify()
+
+        if retire:
+            self._quit(browser)
+
+    def discard(self, browser):
+        """
+        Quits the given browser and removes it from the pool, e.g., when it could not be reset.
+
+        Args:
+            browser (WebDriver): The browser to discard.
+        """
+
+        with self._condition:
+            if browser not in self._uses:
+                return
+            del self._uses[browser]
+            self._prelaunch()
+            self._condition.notify()
+
+        self._quit(browser)
+
+    def quit(self):
+        """ Quits all idle browsers and any browsers checked in later. """
+
+        with self._condition:
+            self._closed = True
+            browsers, self._idle = self._idle, []
+            for browser in browsers:
+                del self._uses[browser]
+            self._condition.notify_all()
+
+        for browser in browsers:
+            self._quit(browser)
+
+    def _quit_at_exit(self):
+        self.quit()
+
+        # Browsers still checked out, e.g., by sessions that were never reset, would be leaked.
+        with self._condition:
+            browsers = list(self._uses)
+            self._uses.clear()
+
+        for browser in browsers:
+            self._quit(browser)
+
+    def _has_room(self):
+        # Must be called while holding the condition.
+        return self.max_size is None or len(self._uses) + self._launching < self.max_size
+
+    def _launch_browser(self, launch):
+        try:
+            return launch()
+        except Exception:
+            with self._condition:
+                self._launching -= 1
+                self._condition.notify()
+            raise
+
+    def _prelaunch(self):
+        # Must be called while holding the condition.
+        if self._closed or self._launch is None:
+            return
+
+        launch = self._launch
+        while len(self._idle) + self._launching < self.min_size and self._has_room():
+            self._launching += 1
+            thread = Thread(target=self._prelaunch_browser, args=(launch,))
+            thread.daemon = True
+            thread.start()
+
+    def _prelaunch_browser(self, launch):
+        try:
+            browser = self._launch_browser(launch)
+        except Exception:
+            return
+
+        with self._condition:
+            self._launching -= 1
+            closed = self._closed
+            if not closed:
+                self._uses[browser] = 0
+                self._idle.append(browser)
+            self._condition.notify()
+
+        if closed:
+            self._quit(browser)
+
+    @staticmethod
+    def _quit(browser):
+        try:
+            browser.quit()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _healthy(browser):
+        try:
+            return len(browser.window_handles) > 0
+        except WebDriverException:
+            return False
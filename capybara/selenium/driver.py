@@ -1,5 +1,7 @@
 import atexit
+from collections import namedtuple
 from contextlib import contextmanager
+from itertools import count
 from selenium.common.exceptions import (
     NoAlertPresentException,
     NoSuchWindowException,
@@ -15,12 +17,23 @@ from time import sleep
 import capybara
 from capybara.driver.base import Base
 from capybara.exceptions import ExpectationNotMet, ModalNotFound
-from capybara.helpers import desc, Timer, toregex
+from capybara.helpers import BackgroundCall, desc, monotonic, Timer, toregex
 from capybara.selenium.browser import get_browser
 from capybara.selenium.node import Node
 from capybara.utils import cached_property, isregex
 
 
+VALID_MODAL_DETECTION = ["intercept", "poll"]
+VALID_PAGE_LOAD_STRATEGIES = ["eager", "none", "normal"]
+VALID_WAIT_STRATEGIES = ["mutation", "poll"]
+
+# Changes that aren't DOM mutations, e.g., to the URL or to window handles, are still noticed
+# within this number of seconds when waiting for mutations.
+_MUTATION_WAIT_LIMIT = 0.5
+
+_PendingNavigation = namedtuple("_PendingNavigation", ["url"])
+
+
 class Driver(Base):
     """
     A Capybara driver that uses Selenium WebDriver to drive a real browser.
@@ -28,6 +41,9 @@ class Driver(Base):
     Args:
         app (object): The WSGI-compliant app to drive.
         browser (str, optional): The name of the browser to use. Defaults to "firefox".
+        browser_pool (BrowserPool, optional): A pool of browsers to check a browser out of,
+            instead of launching one for this driver alone. The browser is checked back in
+            whenever the driver is reset. Defaults to None.
         clear_local_storage (bool, optional): Whether to clear local storage on reset.
             Defaults to False.
         clear_session_storage (bool, optional): Whether to clear session storage on
@@ -35,6 +51,23 @@ class Driver(Base):
         desired_capabilities (Dict[str, str | bool], optional): Desired
             capabilities of the underlying browser. Defaults to a set of
             reasonable defaults provided by Selenium.
+        launch_in_background (bool, optional): Whether to start launching the browser on a
+            background thread as soon as the session is created, e.g., while its server boots,
+            rather than when the browser is first used. Defaults to False.
+        modal_detection (str, optional): How to detect modals when accepting or dismissing them.
+            "poll" polls the browser for a native modal dialog. "intercept" additionally replaces
+            ``window.alert``, ``window.confirm``, and ``window.prompt`` while the modal is expected,
+            answering them in the page without opening a dialog. Defaults to "poll".
+        modal_poll_interval (int | float, optional): The number of seconds between checks for a
+            modal. Defaults to 0.05.
+        page_load_strategy (str, optional): How long the browser blocks when navigating. "normal"
+            waits for the page and all of its resources to load. "eager" only waits for the
+            document to be parsed, and "none" returns as soon as navigation has started. With
+            "eager" and "none", the driver waits for the new document to be ready the next time
+            it is queried. Defaults to "normal".
+        wait_strategy (str, optional): How to wait before retrying a synchronized function. "poll"
+            sleeps for the retry policy's delay. "mutation" waits in the browser until the DOM
+            changes, using a ``MutationObserver``, but no less than the delay. Defaults to "poll".
         options: Arbitrary keyword arguments for the underlying Selenium driver.
     """
 
@@ -42,18 +75,52 @@ class Driver(Base):
         self,
         app,
         browser="firefox",
+        browser_pool=None,
         clear_local_storage=False,
         clear_session_storage=False,
         desired_capabilities=None,
+        launch_in_background=False,
+        modal_detection="poll",
+        modal_poll_interval=0.05,
+        page_load_strategy="normal",
+        wait_strategy="poll",
         **options
     ):
+        assert modal_detection in VALID_MODAL_DETECTION, \
+            "invalid option {modal_detection} for modal_detection, " \
+            "should be one of {valid_values}".format(
+                modal_detection=desc(modal_detection),
+                valid_values=", ".join(desc(value) for value in VALID_MODAL_DETECTION))
+        assert page_load_strategy in VALID_PAGE_LOAD_STRATEGIES, \
+            "invalid option {page_load_strategy} for page_load_strategy, " \
+            "should be one of {valid_values}".format(
+                page_load_strategy=desc(page_load_strategy),
+                valid_values=", ".join(desc(value) for value in VALID_PAGE_LOAD_STRATEGIES))
+        assert wait_strategy in VALID_WAIT_STRATEGIES, \
+            "invalid option {wait_strategy} for wait_strategy, " \
+            "should be one of {valid_values}".format(
+                wait_strategy=desc(wait_strategy),
+                valid_values=", ".join(desc(value) for value in VALID_WAIT_STRATEGIES))
+
         self.app = app
         self._browser_name = browser
+        self._browser_pool = browser_pool
         self._clear_local_storage = clear_local_storage
         self._clear_session_storage = clear_session_storage
         self._desired_capabilities = desired_capabilities
+        self._launch_in_background = launch_in_background
+        self._background_launch = None
+        self._modal_detection = modal_detection
+        self._modal_poll_interval = modal_poll_interval
+        self._page_load_strategy = page_load_strategy
+        self._pending_navigation = None
+        self._wait_strategy = wait_strategy
+        self._mutation_count = None
+        self._script_timeout = None
         self._options = options
         self._frame_handles = []
+        self._modal_handler_ids = count(1)
+        self._reset_timings = {}
 
     @property
     def needs_server(self):
@@ -61,30 +128,30 @@ class Driver(Base):
 
     @cached_property
     def browser(self):
-        capabilities = self._desired_capabilities
+        if self._background_launch is not None:
+            background_launch, self._background_launch = self._background_launch, None
+            return background_launch.join()
 
-        if self._firefox:
-            capabilities = (capabilities or DesiredCapabilities.FIREFOX).copy()
-            # Auto-accept unload alerts triggered by navigating away.
-            if capabilities.get("marionette"):
-                capabilities["unhandledPromptBehavior"] = "dismiss"
-            else:
-                capabilities["unexpectedAlertBehaviour"] = "ignore"
+        return self._checkout_browser()
 
-        browser = get_browser(self._browser_name, capabilities=capabilities, **self._options)
-        atexit.register(browser.quit)
-        return browser
+    def prepare(self):
+        if self._launch_in_background and "browser" not in self.__dict__ and \
+                self._background_launch is None:
+            self._background_launch = BackgroundCall(self._checkout_browser)
 
     @property
     def current_url(self):
+        self._wait_for_navigation()
         return self.browser.current_url
 
     @property
     def title(self):
+        self._wait_for_navigation()
         return self.browser.title
 
     @property
     def html(self):
+        self._wait_for_navigation()
         return self.browser.page_source
 
     @property
@@ -97,9 +164,15 @@ class Driver(Base):
             self.browser.switch_to.default_content()
         elif frame == "parent":
             self._frame_handles.pop()
-            self.browser.switch_to.default_content()
-            for frame_handle in self._frame_handles:
-                self.browser.switch_to.frame(frame_handle)
+            try:
+                # Step up a single level instead of replaying the whole frame path.
+                self.browser.switch_to.parent_frame()
+            except (AttributeError, WebDriverException):
+                # Older clients and browsers may not support switching to the parent frame, and
+                # some refuse to leave a frame that has been removed from its parent document.
+                self.browser.switch_to.default_content()
+                for frame_handle in self._frame_handles:
+                    self.browser.switch_to.frame(frame_handle)
         else:
             self._frame_handles.append(frame.native)
             self.browser.switch_to.frame(frame.native)
@@ -153,22 +226,40 @@ class Driver(Base):
         return NoSuchWindowException
 
     def visit(self, url):
-        self.browser.get(url)
+        with self._navigation(url):
+            self.browser.get(url)
 
     def refresh(self):
+        if not self._has_unload_handler:
+            with self._navigation():
+                try:
+                    self.browser.refresh()
+                except UnexpectedAlertPresentException:
+                    pass
+                # Handlers added with addEventListener can't be detected up front, so check for
+                # the unload modal they may have opened instead.
+                alert = EC.alert_is_present()(self.browser)
+                if alert:
+                    alert.accept()
+            return
+
         try:
             with self.accept_modal(None, wait=0.1):
-                self.browser.refresh()
+                with self._navigation():
+                    self.browser.refresh()
         except ModalNotFound:
             pass
 
     def go_back(self):
-        self.browser.back()
+        with self._navigation():
+            self.browser.back()
 
     def go_forward(self):
-        self.browser.forward()
+        with self._navigation():
+            self.browser.forward()
 
     def execute_script(self, script, *args):
+        self._wait_for_navigation()
         args = [arg.native if isinstance(arg, Node) else arg for arg in args]
         return self.browser.execute_script(script, *args)
 
@@ -177,7 +268,8 @@ class Driver(Base):
         return self._wrap_element_script_result(result)
 
     def evaluate_async_script(self, script, *args):
-        self.browser.set_script_timeout(capybara.default_max_wait_time)
+        self._wait_for_navigation()
+        self._set_script_timeout(capybara.default_max_wait_time)
         args = [arg.native if isinstance(arg, Node) else arg for arg in args]
         result = self.browser.execute_async_script(script, *args)
         return self._wrap_element_script_result(result)
@@ -187,72 +279,70 @@ class Driver(Base):
 
     @contextmanager
     def accept_modal(self, modal_type, text=None, response=None, wait=None):
+        handler_id = self._intercept_modal(modal_type, accept=True, response=response)
         yield
-        modal = self._find_modal(text=text, wait=wait)
+        modal = self._find_modal(text=text, wait=wait, handler_id=handler_id)
         if response:
             modal.send_keys(response)
         modal.accept()
+        # Only remove the handler once the modal is closed, as any command dismisses a native one.
+        self._remove_modal_handler(handler_id)
 
     @contextmanager
     def dismiss_modal(self, modal_type, text=None, wait=None):
+        handler_id = self._intercept_modal(modal_type, accept=False)
         yield
-        modal = self._find_modal(text=text, wait=wait)
+        modal = self._find_modal(text=text, wait=wait, handler_id=handler_id)
         modal.dismiss()
+        self._remove_modal_handler(handler_id)
 
     def reset(self):
         # Avoid starting the browser just to reset the session.
         if "browser" in self.__dict__:
-            navigated = False
-            timer = Timer(10)
-            while True:
-                try:
-                    # Only trigger a navigation if we haven't done it already,
-                    # otherwise it can trigger an endless series of unload modals.
-                    if not navigated:
-                        self.browser.delete_all_cookies()
-                        self._clear_storage()
-                        self.browser.get("about:blank")
-                        navigated = True
+            try:
+                self._reset_browser()
+            except Exception:
+                if self._browser_pool is not None:
+                    self._browser_pool.discard(self._release_browser())
+                raise
 
-                    while True:
-                        try:
-                            next(self._find_xpath("/html/body/*"))
-                        except StopIteration:
-                            break
-                        if timer.expired:
-                            raise ExpectationNotMet("Timed out waiting for Selenium session reset")
-                        sleep(0.05)
+            # Return the browser to the pool, to be checked out again when next needed.
+            if self._browser_pool is not None:
+                self._browser_pool.checkin(self._release_browser())
 
-                    break
-                except UnexpectedAlertPresentException:
-                    # This error is thrown if an unhandled alert is on the page.
-                    try:
-                        self.browser.switch_to.alert.accept()
-
-                        # Allow time for the modal to be handled.
-                        sleep(0.25)
-                    except NoAlertPresentException:
-                        # The alert is now gone.
-
-                        if self.browser.current_url != "about:blank":
-                            # If navigation has not occurred, Firefox may have dismissed the alert
-                            # before we could accept it.
-
-                            # Try to navigate again, anticipating the alert this time.
-                            try:
-                                self.browser.get("about:blank")
-                                sleep(0.1)  # Wait for the alert.
-                                self.browser.switch_to.alert.accept()
-                            except NoAlertPresentException:
-                                # No alert appeared this time.
-                                pass
-
-                    # Try cleaning up the browser again.
-                    continue
-
-            for handle in self.window_handles:
-                if handle != self.current_window_handle:
-                    self.close_window(handle)
+    @property
+    def pending_requests(self):
+        self._wait_for_navigation()
+        return self._count_requests()
+
+    def wait_for_change(self, delay, timeout):
+        if self._wait_strategy == "poll":
+            return super(Driver, self).wait_for_change(delay, timeout)
+
+        start = monotonic()
+        try:
+            wait = min(timeout, _MUTATION_WAIT_LIMIT)
+            self._set_script_timeout(wait + 1)
+            self._mutation_count = self.browser.execute_async_script(
+                _WAIT_FOR_MUTATION_SCRIPT, self._mutation_count, int(wait * 1000))
+        except WebDriverException:
+            # The page may be navigating or showing a modal, so fall back to polling.
+            pass
+
+        # Still space retries out by the policy's delay, so that pages which mutate continuously,
+        # e.g., with spinners or timers, aren't queried back to back.
+        remaining = min(delay, timeout) - (monotonic() - start)
+        if remaining > 0:
+            sleep(remaining)
+
+    @property
+    def reset_timings(self):
+        """
+        Dict[str, float]: The number of seconds spent in each phase of the last reset: clearing
+        "cookies" and "storage", "navigation" to a blank page, and closing other "windows".
+        """
+
+        return dict(self._reset_timings)
 
     @property
     def invalid_element_errors(self):
@@ -270,31 +360,341 @@ class Driver(Base):
     def _firefox(self):
         return self._browser_name in ["ff", "firefox"]
 
+    def _checkout_browser(self):
+        if self._browser_pool is not None:
+            return self._browser_pool.checkout(self._launch_browser)
+
+        browser = self._launch_browser()
+        atexit.register(browser.quit)
+        return browser
+
+    def _launch_browser(self):
+        capabilities = self._desired_capabilities
+
+        if self._firefox:
+            capabilities = (capabilities or DesiredCapabilities.FIREFOX).copy()
+            # Auto-accept unload alerts triggered by navigating away.
+            if capabilities.get("marionette"):
+                capabilities["unhandledPromptBehavior"] = "dismiss"
+            else:
+                capabilities["unexpectedAlertBehaviour"] = "ignore"
+
+        if self._page_load_strategy != "normal":
+            capabilities = dict(capabilities or {}, pageLoadStrategy=self._page_load_strategy)
+
+        return get_browser(self._browser_name, capabilities=capabilities, **self._options)
+
+    def _release_browser(self):
+        self._frame_handles = []
+        self._script_timeout = None
+        self._pending_navigation = None
+        return self.__dict__.pop("browser")
+
+    def _reset_browser(self):
+        self._reset_timings = {}
+        self._pending_navigation = None
+        navigated = False
+        timer = Timer(10)
+        while True:
+            try:
+                # Only trigger a navigation if we haven't done it already,
+                # otherwise it can trigger an endless series of unload modals.
+                if not navigated:
+                    with self._reset_phase("cookies"):
+                        self.browser.delete_all_cookies()
+                    with self._reset_phase("storage"):
+                        self._clear_storage()
+                    with self._reset_phase("navigation"):
+                        self.browser.get("about:blank")
+                    navigated = True
+
+                with self._reset_phase("navigation"):
+                    # Check that the blank page has loaded and is empty in a single round trip.
+                    while not self.browser.execute_script(_BLANK_PAGE_LOADED_SCRIPT):
+                        if timer.expired:
+                            raise ExpectationNotMet("Timed out waiting for Selenium session reset")
+                        sleep(0.05)
+
+                break
+            except UnexpectedAlertPresentException:
+                # This error is thrown if an unhandled alert is on the page.
+                try:
+                    self.browser.switch_to.alert.accept()
+
+                    # Allow time for the modal to be handled.
+                    sleep(0.25)
+                except NoAlertPresentException:
+                    # The alert is now gone.
+
+                    if self.browser.current_url != "about:blank":
+                        # If navigation has not occurred, Firefox may have dismissed the alert
+                        # before we could accept it.
+
+                        # Try to navigate again, anticipating the alert this time.
+                        try:
+                            self.browser.get("about:blank")
+                            sleep(0.1)  # Wait for the alert.
+                            self.browser.switch_to.alert.accept()
+                        except NoAlertPresentException:
+                            # No alert appeared this time.
+                            pass
+
+                # Try cleaning up the browser again.
+                continue
+
+        with self._reset_phase("windows"):
+            self._close_other_windows()
+
+    @contextmanager
+    def _reset_phase(self, name):
+        start = monotonic()
+        try:
+            yield
+        finally:
+            self._reset_timings[name] = self._reset_timings.get(name, 0) + monotonic() - start
+
     def _clear_storage(self):
         if "browser" in self.__dict__:
-            if self._clear_local_storage:
-                self.execute_script("window.localStorage.clear()")
-            if self._clear_session_storage:
-                self.execute_script("window.sessionStorage.clear()")
+            if self._clear_local_storage or self._clear_session_storage:
+                self.execute_script(
+                    _CLEAR_STORAGE_SCRIPT, self._clear_local_storage, self._clear_session_storage)
+
+    def _close_other_windows(self):
+        # Close the other windows in one pass, only switching back once they are all closed.
+        current_handle = self.current_window_handle
+        other_handles = [handle for handle in self.window_handles if handle != current_handle]
+        if not other_handles:
+            return
+
+        try:
+            for handle in other_handles:
+                try:
+                    self.browser.switch_to.window(handle)
+                    self.browser.close()
+                except NoSuchWindowException:
+                    pass
+        finally:
+            self.browser.switch_to.window(current_handle)
+
+    def _current_window_metadata(self):
+        # Collect everything in a single round trip.
+        title, url, ready_state = self.browser.execute_script(
+            "return [document.title, document.location.href, document.readyState]")
+        return {"title": title, "url": url, "loaded": ready_state == "complete"}
+
+    @contextmanager
+    def _navigation(self, url=None):
+        if self._page_load_strategy == "normal":
+            yield
+            # Count the new page's requests from now on, rather than from when they're first
+            # checked, which would miss those made in the meantime.
+            self._count_requests()
+            return
+
+        try:
+            # Mark the current document, so that it isn't mistaken for the new one.
+            self.browser.execute_script(_MARK_DOCUMENT_SCRIPT)
+        except WebDriverException:
+            pass
+
+        yield
+        self._pending_navigation = _PendingNavigation(url)
+
+    def _wait_for_navigation(self):
+        navigation = self._pending_navigation
+        if navigation is None:
+            return
+
+        timer = Timer(capybara.default_max_wait_time)
+        while not self.browser.execute_script(
+                _NAVIGATION_COMMITTED_SCRIPT, navigation.url):
+            if timer.expired:
+                raise ExpectationNotMet("Timed out waiting for the navigation to {} to load".format(
+                    navigation.url or "the next page"))
+            sleep(0.05)
+
+        self._pending_navigation = None
+        self._count_requests()
+
+    def _count_requests(self):
+        """
+        Starts counting the requests the page makes, if it hasn't already.
+
+        Returns:
+            int: The number of requests the page has in flight.
+        """
+
+        try:
+            return self.browser.execute_script(_COUNT_REQUESTS_SCRIPT)
+        except WebDriverException:
+            # The page may be navigating or showing a modal.
+            return 0
 
     def _find_css(self, css):
+        self._wait_for_navigation()
         return (Node(self, element) for element in self.browser.find_elements_by_css_selector(css))
 
     def _find_xpath(self, xpath):
+        self._wait_for_navigation()
         return (Node(self, element) for element in self.browser.find_elements_by_xpath(xpath))
 
-    def _find_modal(self, text=None, wait=None):
+    @property
+    def _stops_finding_early(self):
+        return True
+
+    def _find_limited_css(self, css, limit):
+        return [Node(self, element, relocator)
+                for element, relocator in self._find_limited_elements("css", css, limit)]
+
+    def _find_limited_xpath(self, xpath, limit):
+        return [Node(self, element, relocator)
+                for element, relocator in self._find_limited_elements("xpath", xpath, limit)]
+
+    def _find_relocated_css(self, relocator, css):
+        return [Node(self, element, relocator)
+                for element in self._find_relocated_elements(relocator, css)]
+
+    def _find_limited_elements(self, format, query, limit, context=None):
+        """
+        Finds at most the given number of elements matching the given query within the page, so
+        that only those elements need to be returned by the browser. Each element is returned
+        along with an XPath expression for cheaply finding it again, where one can be computed.
+
+        Args:
+            format (str): The format of the query, "css" or "xpath".
+            query (str): The query to match.
+            limit (int): The maximum number of elements to find.
+            context (WebElement, optional): The element relative to which the query should be
+                resolved. Defaults to the document.
+
+        Returns:
+            List[Tuple[WebElement, str | None]]: The first matching elements and their
+                relocators.
+        """
+
+        if context is None:
+            self._wait_for_navigation()
+        return [tuple(pair) for pair in self.browser.execute_script(
+            _FIND_LIMITED_SCRIPT, format, query, limit, context)]
+
+    def _find_relocated_elements(self, relocator, css, context=None):
+        """
+        Finds the element which the given relocator finds again, as long as it still matches the
+        given CSS query, checking both within the page in a single call.
+
+        Args:
+            relocator (str): An XPath expression which finds the element from the document.
+            css (str): The CSS query the element must still match.
+            context (WebElement, optional): The element relative to which the query was resolved.
+                Defaults to the document.
+
+        Returns:
+            List[WebElement]: The relocated element, if it still matches the query.
+        """
+
+        if context is None:
+            self._wait_for_navigation()
+        return self.browser.execute_script(_FIND_RELOCATED_SCRIPT, relocator, css, context)
+
+    @property
+    def _has_unload_handler(self):
+        try:
+            return self.browser.execute_script("return window.onbeforeunload != null")
+        except WebDriverException:
+            # Assume the worst, e.g., if a modal is already open.
+            return True
+
+    def _intercept_modal(self, modal_type, accept, response=None):
+        """
+        Registers an in-page handler that answers the next modal of the given type, if modals are
+        being intercepted.
+
+        Args:
+            modal_type (str | None): The type of modal to answer, or None for any type.
+            accept (bool): Whether to accept the modal.
+            response (str, optional): The response to give to a prompt.
+
+        Returns:
+            int | None: The id of the registered handler, if any.
+        """
+
+        if self._modal_detection != "intercept":
+            return None
+
+        handler_id = next(self._modal_handler_ids)
+        try:
+            self.browser.execute_script(_INTERCEPT_MODAL_SCRIPT, {
+                "id": handler_id,
+                "type": modal_type,
+                "accept": accept,
+                "response": response})
+        except WebDriverException:
+            # Fall back to polling for a native modal.
+            return None
+        return handler_id
+
+    def _find_modal(self, text=None, wait=None, handler_id=None):
         wait = wait or capybara.default_max_wait_time
         try:
-            alert = WebDriverWait(self.browser, wait).until(EC.alert_is_present())
-            regexp = toregex(text)
-            if not regexp.search(alert.text):
-                qualifier = "matching" if isregex(text) else "with"
-                raise ModalNotFound("Unable to find modal dialog {0} {1}".format(qualifier, desc(text)))
-            return alert
+            modal = WebDriverWait(
+                self.browser, wait, poll_frequency=self._modal_poll_interval
+            ).until(lambda browser: self._modal_present(handler_id))
         except TimeoutException:
+            self._remove_modal_handler(handler_id)
             raise ModalNotFound("Unable to find modal dialog")
 
+        regexp = toregex(text)
+        if not regexp.search(modal.text):
+            if isinstance(modal, _InterceptedModal):
+                # No native modal is open, so the handler can safely be removed.
+                self._remove_modal_handler(handler_id)
+            qualifier = "matching" if isregex(text) else "with"
+            raise ModalNotFound("Unable to find modal dialog {0} {1}".format(qualifier, desc(text)))
+        return modal
+
+    def _modal_present(self, handler_id=None):
+        """
+        Returns the modal that has been opened, if any.
+
+        Args:
+            handler_id (int, optional): The id of the in-page handler expected to answer the modal.
+
+        Returns:
+            Alert | _InterceptedModal | bool: The modal, or False if no modal has been opened.
+        """
+
+        # Always check for a native modal first, as any other command may dismiss it.
+        alert = EC.alert_is_present()(self.browser)
+        if alert or handler_id is None:
+            return alert
+
+        try:
+            intercepted_text = self.browser.execute_script(
+                _INTERCEPTED_MODAL_TEXT_SCRIPT, handler_id)
+        except UnexpectedAlertPresentException:
+            return False
+        if intercepted_text is None:
+            return False
+        return _InterceptedModal(intercepted_text)
+
+    def _remove_modal_handler(self, handler_id):
+        """
+        Removes the given in-page modal handler, if any. This must not be called while a native
+        modal is open, as any command may dismiss it.
+
+        Args:
+            handler_id (int | None): The id of the handler to remove.
+        """
+
+        if handler_id is None:
+            return
+
+        try:
+            self.browser.execute_script(_REMOVE_MODAL_HANDLER_SCRIPT, handler_id)
+        except WebDriverException:
+            # The page (and its handlers) may be gone or blocked by a native modal.
+            pass
+
     @contextmanager
     def _window(self, handle):
         original_handle = self.current_window_handle
@@ -307,6 +707,12 @@ class Driver(Base):
             finally:
                 self.switch_to_window(original_handle)
 
+    def _set_script_timeout(self, seconds):
+        # Avoid a round trip when the timeout hasn't changed.
+        if seconds != self._script_timeout:
+            self.browser.set_script_timeout(seconds)
+            self._script_timeout = seconds
+
     def _wrap_element_script_result(self, arg):
         if isinstance(arg, list):
             return [self._wrap_element_script_result(e) for e in arg]
@@ -316,3 +722,218 @@ class Driver(Base):
             return Node(self, arg)
         else:
             return arg
+
+
+class _InterceptedModal(object):
+    """
+    A modal which has already been answered by an in-page handler. It mimics the interface of a
+    Selenium ``Alert``.
+
+    Args:
+        text (str): The text of the modal.
+    """
+
+    def __init__(self, text):
+        self.text = text
+
+    def accept(self):
+        pass
+
+    def dismiss(self):
+        pass
+
+    def send_keys(self, keys):
+        pass
+
+
+_BLANK_PAGE_LOADED_SCRIPT = """
+return document.readyState === "complete" &&
+  (document.body === null || document.body.firstElementChild === null);
+"""
+
+_MARK_DOCUMENT_SCRIPT = """
+document.__capybaraNavigatedFrom = document.location.href;
+"""
+
+_NAVIGATION_COMMITTED_SCRIPT = """
+var url = arguments[0], navigatedFrom = document.__capybaraNavigatedFrom;
+var href = document.location.href;
+if (document.readyState === "loading") { return false; }
+if (navigatedFrom === undefined) { return true; }
+if (url === null) {
+  // Refreshing replaces the document. History traversal may stay within it, e.g., between
+  // fragments, in which case only its URL changes.
+  return href !== navigatedFrom;
+}
+// Navigating to a fragment of the current page doesn't replace the document, but navigating to
+// the page itself does, even if it's the current URL.
+return url.indexOf("#") !== -1 && href === url &&
+  url.split("#")[0] === navigatedFrom.split("#")[0];
+"""
+
+_CLEAR_STORAGE_SCRIPT = """
+if (arguments[0]) { window.localStorage.clear(); }
+if (arguments[1]) { window.sessionStorage.clear(); }
+"""
+
+_COUNT_REQUESTS_SCRIPT = """
+var state = window.__capybaraRequests;
+if (!state) {
+  // Count requests from now on, finishing them only once their callbacks have run.
+  state = window.__capybaraRequests = {pending: 0};
+  var finish = function() { setTimeout(function() { state.pending--; }, 0); };
+  var send = XMLHttpRequest.prototype.send;
+  XMLHttpRequest.prototype.send = function() {
+    state.pending++;
+    this.addEventListener("loadend", finish);
+    try {
+      return send.apply(this, arguments);
+    } catch (e) {
+      finish();
+      throw e;
+    }
+  };
+  if (window.fetch) {
+    var fetch = window.fetch;
+    window.fetch = function() {
+      state.pending++;
+      var promise = fetch.apply(this, arguments);
+      promise.then(finish, finish);
+      return promise;
+    };
+  }
+}
+return state.pending;
+"""
+
+_WAIT_FOR_MUTATION_SCRIPT = """
+var lastCount = arguments[0], timeout = arguments[1], done = arguments[arguments.length - 1];
+var state = document.__capybaraMutations;
+if (!state) {
+  // Keep counting mutations between waits, so that none are missed while a query runs.
+  state = document.__capybaraMutations = {count: 0, listeners: []};
+  new MutationObserver(function() {
+    state.count++;
+    var listeners = state.listeners;
+    state.listeners = [];
+    listeners.forEach(function(listener) { listener(); });
+  }).observe(document, {attributes: true, characterData: true, childList: true, subtree: true});
+  done(state.count);
+  return;
+}
+if (state.count !== lastCount) {
+  done(state.count);
+  return;
+}
+var timer;
+var listener = function() {
+  clearTimeout(timer);
+  done(state.count);
+};
+state.listeners.push(listener);
+timer = setTimeout(function() {
+  state.listeners = state.listeners.filter(function(l) { return l !== listener; });
+  done(state.count);
+}, timeout);
+"""
+
+_FIND_LIMITED_SCRIPT = """
+  var format = arguments[0], query = arguments[1], limit = arguments[2],
+      context = arguments[3] || document, elements = [], i, node;
+  if (format === "css") {
+    var nodes = context.querySelectorAll(query);
+    for (i = 0; i < nodes.length && elements.length < limit; i++) {
+      elements.push(nodes[i]);
+    }
+  } else {
+    var result = document.evaluate(
+      query, context, null, XPathResult.ORDERED_NODE_ITERATOR_TYPE, null);
+    while (elements.length < limit && (node = result.iterateNext())) {
+      if (node.nodeType === 1) {
+        elements.push(node);
+      }
+    }
+  }
+
+  function relocator(element) {
+    var doc = element.ownerDocument, id = element.id, path = [], node, sibling, index;
+    if (id && id.indexOf("'") === -1 && doc.getElementById(id) === element) {
+      return "//*[@id='" + id + "']";
+    }
+    for (node = element; node.nodeType === 1; node = node.parentNode) {
+      // Unprefixed XPath name tests only match HTML elements.
+      if (node.namespaceURI !== "http://www.w3.org/1999/xhtml") { return null; }
+      index = 1;
+      sibling = node;
+      while ((sibling = sibling.previousElementSibling)) {
+        if (sibling.localName === node.localName) { index++; }
+      }
+      path.unshift(node.localName + "[" + index + "]");
+    }
+    // Elements within a shadow root can't be found from the document.
+    return node === doc ? "/" + path.join("/") : null;
+  }
+
+  return elements.map(function(element) { return [element, relocator(element)]; });
+"""
+
+_FIND_RELOCATED_SCRIPT = """
+  var relocator = arguments[0], query = arguments[1], context = arguments[2] || document;
+  var node = document.evaluate(
+    relocator, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+  // Like querySelectorAll, only match descendants of the context.
+  var found = node && node !== context && context.contains(node) && node.matches(query);
+  return found ? [node] : [];
+"""
+
+_INTERCEPT_MODAL_SCRIPT = """
+  (function(handler) {
+    var capybara = window.__capybaraModals;
+    if (!capybara) {
+      capybara = window.__capybaraModals = {handlers: [], opened: {}};
+      ["alert", "confirm", "prompt"].forEach(function(type) {
+        var original = window[type];
+        window[type] = function(text, defaultValue) {
+          for (var i = capybara.handlers.length - 1; i >= 0; i--) {
+            var handler = capybara.handlers[i];
+            if (handler.type === null || handler.type === type) {
+              capybara.handlers.splice(i, 1);
+              capybara.opened[handler.id] = text === undefined ? "" : String(text);
+              if (type === "alert") {
+                return;
+              } else if (type === "confirm") {
+                return handler.accept;
+              } else if (!handler.accept) {
+                return null;
+              } else if (handler.response !== null) {
+                return handler.response;
+              } else {
+                return defaultValue === undefined ? "" : String(defaultValue);
+              }
+            }
+          }
+          return original.apply(window, arguments);
+        };
+      });
+    }
+    capybara.handlers.push(handler);
+  })(arguments[0]);
+"""
+
+_INTERCEPTED_MODAL_TEXT_SCRIPT = """
+  var capybara = window.__capybaraModals;
+  if (capybara && arguments[0] in capybara.opened) {
+    return capybara.opened[arguments[0]];
+  }
+  return null;
+"""
+
+_REMOVE_MODAL_HANDLER_SCRIPT = """
+  var capybara = window.__capybaraModals, id = arguments[0];
+  if (capybara) {
+    capybara.handlers = capybara.handlers.filter(function(handler) {
+      return handler.id !== id;
+    });
+    delete capybara.opened[id];
+  }
+"""
@@ -16,6 +16,24 @@ from capybara.helpers import normalize_whitespace
 
 
 class Node(Base):
+    """
+    A node in a page driven by Selenium.
+
+    Args:
+        driver (driver.Base): The driver used to find this node.
+        native (WebElement): The native element returned by Selenium.
+        relocator (str, optional): An XPath expression which finds this node again from the
+            document, if one was computed when the node was found.
+    """
+
+    def __init__(self, driver, native, relocator=None):
+        super(Node, self).__init__(driver, native)
+        self._relocator = relocator
+
+    @property
+    def relocator(self):
+        return self._relocator
+
     @property
     def tag_name(self):
         return self.native.tag_name
@@ -95,6 +113,28 @@ class Node(Base):
         return (cls(self.driver, element)
                 for element in self.native.find_elements_by_xpath(xpath))
 
+    @property
+    def _stops_finding_early(self):
+        return True
+
+    def _find_limited_css(self, css, limit):
+        cls = type(self)
+        return [cls(self.driver, element, relocator)
+                for element, relocator in self.driver._find_limited_elements(
+                    "css", css, limit, self.native)]
+
+    def _find_limited_xpath(self, xpath, limit):
+        cls = type(self)
+        return [cls(self.driver, element, relocator)
+                for element, relocator in self.driver._find_limited_elements(
+                    "xpath", xpath, limit, self.native)]
+
+    def _find_relocated_css(self, relocator, css):
+        cls = type(self)
+        return [cls(self.driver, element, relocator)
+                for element in self.driver._find_relocated_elements(
+                    relocator, css, self.native)]
+
     def click(self, *keys, **offset):
         try:
             if not any(keys) and not self._has_coords(offset):
@@ -1,22 +1,91 @@
-from contextlib import closing
-from threading import Thread
-from time import sleep
+from bisect import bisect_left
+from collections import namedtuple
+from contextlib import closing, contextmanager
+from gzip import GzipFile
+from hashlib import md5
+from io import BytesIO
+from mimetypes import guess_type
+import os
+from socket import create_connection, error as SocketError
+from threading import Event, Lock, Thread
 
 import capybara
 from capybara.compat import URLError, urlopen
-from capybara.helpers import Timer
+from capybara.helpers import monotonic, Timer
 from capybara.utils import (
     Counter,
+    bind_socket,
     cached_property,
     decode_bytes,
     encode_string,
     find_available_port)
 
 
+class ServerRegistry(object):
+    """
+    The servers booted in this process, keyed by host and app, so that serving the same app on the
+    same host again reuses the running server without making any requests to it.
+    """
+
+    def __init__(self):
+        self.lock = Lock()
+        self._servers = {}
+
+    @property
+    def servers(self):
+        """ List[Server]: The registered servers. """
+        with self.lock:
+            return list(self._servers.values())
+
+    def get(self, key):
+        return self._servers.get(key)
+
+    def add(self, server):
+        self._servers[server.port_key] = server
+
+    def remove(self, server):
+        with self.lock:
+            registered = self._servers.get(server.port_key)
+            if registered and registered.server_thread is server.server_thread:
+                del self._servers[server.port_key]
+
+    def shutdown_idle(self, idle_for=0):
+        """
+        Shuts down the servers that have had no requests in flight for the given time.
+
+        Args:
+            idle_for (int | float, optional): The number of seconds a server must have been idle.
+                Defaults to 0.
+
+        Returns:
+            List[Server]: The servers that were shut down.
+        """
+
+        servers = [server for server in self.servers
+                   if not server.has_pending_requests and server.idle_time >= idle_for]
+        for server in servers:
+            server.shutdown()
+        return servers
+
+    def shutdown_all(self):
+        """ Shuts down all registered servers. """
+        for server in self.servers:
+            server.shutdown()
+
+
 class Server(object):
     """
     Serves a WSGI-compliant app for Capybara to test.
 
+    Booted servers are kept in :attr:`registry` until they are shut down. Servers can also be used
+    as context managers, which boot them on entry and shut them down on exit::
+
+        with Server(app) as server:
+            ...
+
+    If :data:`capybara.server_routing` is set, apps are mounted on a single server per host, which
+    routes requests to them by host name or path prefix. See :attr:`url`.
+
     Args:
         app (object): The WSGI-compliant app to serve.
         port (int, optional): The port on which the server should be available.
@@ -27,6 +96,10 @@ class Server(object):
     """
 
     _ports = {}
+    _routers = {}
+
+    registry = ServerRegistry()
+    """ ServerRegistry: The servers booted in this process. """
 
     def __init__(self, app, port=None, host=None):
         self.app = app
@@ -38,10 +111,19 @@ class Server(object):
         self.port = (
             port or
             capybara.server_port or
-            type(self)._ports.get(self.port_key, None) or
-            find_available_port())
+            type(self)._ports.get(self.port_key, None))
 
         self.server_thread = None
+        self.socket = None
+        self.mount = None
+        self._router = None
+        self._stop = None
+
+    def __enter__(self):
+        return self.boot()
+
+    def __exit__(self, *args):
+        self.shutdown()
 
     @property
     def error(self):
@@ -52,18 +134,39 @@ class Server(object):
 
     @property
     def port_key(self):
-        return str(id(self.app))
+        return "{0}:{1}".format(self.host, id(self.app))
 
     @cached_property
     def middleware(self):
-        return Middleware(self.app)
+        return Middleware(self.app, static_paths=capybara.server_static_paths)
 
-    def wait_for_pending_requests(self):
-        timer = Timer(60)
-        while self.has_pending_requests:
-            if timer.expired:
-                raise RuntimeError("Requests did not finish in 60 seconds")
-            sleep(0.01)
+    @property
+    def url(self):
+        """ str: The base URL of the app, including the host name or path it is mounted on. """
+
+        if self.mount and self._router.routing == "host":
+            return "http://{0}.{1}:{2}".format(self.mount, self._router.domain, self.port)
+        elif self.mount:
+            return "http://{0}:{1}/{2}".format(self.host, self.port, self.mount)
+        else:
+            return "http://{0}:{1}".format(self.host, self.port)
+
+    def wait_for_pending_requests(self, timeout=60):
+        """
+        Waits for the requests in flight to finish, returning as soon as the last one does.
+
+        Args:
+            timeout (int | float, optional): The maximum number of seconds to wait. Defaults to 60.
+
+        Raises:
+            RuntimeError: If the requests don't finish in time.
+        """
+
+        if not self.middleware.counter.wait_for_zero(timeout):
+            raise RuntimeError("Requests did not finish in {0} seconds: {1}".format(
+                timeout,
+                ", ".join("{0} ({1:.1f}s)".format(request, seconds)
+                          for request, seconds in self.pending_requests)))
 
     def boot(self):
         """
@@ -73,35 +176,168 @@ class Server(object):
             Server: This server.
         """
 
-        if not self.responsive:
-            # Remember the port so we can reuse it if we try to serve this same app again.
-            type(self)._ports[self.port_key] = self.port
+        registry = type(self).registry
+        with registry.lock:
+            server = registry.get(self.port_key)
+            if server and server.running and self.port in (None, server.port):
+                self._adopt(server)
+            elif not self._adopt_running_server():
+                self._start()
+                registry.add(self)
 
-            init_func = capybara.servers[capybara.server_name]
+        return self
+
+    def shutdown(self, timeout=60):
+        """
+        Shuts the server down, after waiting for the requests in flight to finish, and releases
+        its port. Servers not registered as accepting a socket can't be stopped, and are only
+        removed from the :attr:`registry`.
+
+        Args:
+            timeout (int | float, optional): The maximum number of seconds to wait for requests
+                in flight. Defaults to 60.
+        """
+
+        type(self).registry.remove(self)
+        type(self)._ports.pop(self.port_key, None)
+
+        if self.mount:
+            self._router.unmount(self.mount)
+        elif self.running and self._stop:
+            self.middleware.counter.wait_for_zero(timeout)
+
+            stopper = Thread(target=self._stop)
+            stopper.daemon = True
+            stopper.start()
+
+            # Servers only check whether they should stop between polls for new connections, so
+            # connect to wake them up right away.
+            while stopper.is_alive():
+                self._wake()
+                stopper.join(0.01)
+
+            self.server_thread.join(timeout)
+
+        if self.socket:
+            self.socket.close()
+
+        self.server_thread = None
+        self.socket = None
+        self.mount = None
+        self._router = None
+        self._stop = None
+
+    def _wake(self):
+        host = {"0.0.0.0": "127.0.0.1", "::": "::1"}.get(self.host, self.host)
+        try:
+            create_connection((host, self.port), 0.1).close()
+        except SocketError:
+            pass
+
+    @property
+    def idle_time(self):
+        """ float: The number of seconds since the server last had requests in flight. """
+        return self.middleware.idle_time
+
+    def stats(self):
+        """
+        Returns the latency, response sizes, and statuses of the requests served since the stats
+        were last reset. See :meth:`RequestStats.snapshot`.
+
+        Returns:
+            Dict[str, Dict[str, object]]: The stats of each method and path.
+        """
+
+        return self.middleware.stats.snapshot()
+
+    def reset_stats(self):
+        """ Forgets the stats of the requests served so far. """
+        self.middleware.stats.reset()
+
+    @property
+    def running(self):
+        """ bool: Whether this server's thread is running. """
+        return bool(self.server_thread and self.server_thread.is_alive())
+
+    def _adopt(self, server):
+        self.port = server.port
+        self.server_thread = server.server_thread
+        self.socket = server.socket
+        self.mount = server.mount
+        self._router = server._router
+        self._stop = server._stop
+        self.__dict__["middleware"] = server.middleware
+
+    def _adopt_running_server(self):
+        # A server for this app may have been booted elsewhere, e.g., by another process.
+        return self.port is not None and self.responsive
+
+    def _start(self):
+        if capybara.server_routing:
+            self._mount(capybara.server_routing)
+        else:
+            self._listen()
+
+    def _listen(self):
+        init_func = capybara.servers[capybara.server_name]
+        ready = Event()
+
+        def set_ready(stop):
+            self._stop = stop
+            ready.set()
+
+        if getattr(init_func, "accepts_socket", False):
+            self.socket = bind_socket(self.host, self.port or 0)
+            self.port = self.socket.getsockname()[1]
+            init_args = (self.middleware, self.port, self.host)
+            init_kwargs = {"socket": self.socket, "ready": set_ready}
+        else:
+            self.port = self.port or find_available_port()
             init_args = (self.middleware, self.port, self.host)
+            init_kwargs = {}
 
-            self.server_thread = Thread(target=init_func, args=init_args)
+        # Remember the port so we can reuse it if we try to serve this same app again.
+        type(self)._ports[self.port_key] = self.port
 
-            # Inform Python that it shouldn't wait for this thread to terminate before
-            # exiting. (It will still be appropriately terminated when the process exits.)
-            self.server_thread.daemon = True
+        self.server_thread = Thread(target=init_func, args=init_args, kwargs=init_kwargs)
 
-            self.server_thread.start()
+        # Inform Python that it shouldn't wait for this thread to terminate before
+        # exiting. (It will still be appropriately terminated when the process exits.)
+        self.server_thread.daemon = True
 
-            # Make sure the server actually starts and becomes responsive.
-            timer = Timer(60)
-            while not self.responsive:
-                if timer.expired:
-                    raise RuntimeError("WSGI application timed out during boot")
-                self.server_thread.join(0.1)
+        self.server_thread.start()
 
-        return self
+        # Make sure the server actually starts. Servers given a socket signal when they are ready;
+        # others must be polled until they respond.
+        timer = Timer(60)
+        while not (ready.wait(0.1) if init_kwargs else self.responsive):
+            if not self.server_thread.is_alive():
+                raise RuntimeError("WSGI application server stopped during boot")
+            if timer.expired:
+                raise RuntimeError("WSGI application timed out during boot")
+
+    def _mount(self, routing):
+        assert routing in ["host", "path"], "routing should be \"host\" or \"path\""
+
+        domain = capybara.server_routing_domain
+        key = (self.host, routing, domain)
+        server = type(self)._routers.get(key)
+        if not (server and server.running):
+            server = Server(Router(routing, domain), port=self.port, host=self.host)
+            server._listen()
+            type(self)._routers[key] = server
+            type(self).registry.add(server)
+
+        self._router = server.app
+        self.mount = self._router.mount(self.middleware)
+        self.port = server.port
+        self.server_thread = server.server_thread
 
     @property
     def responsive(self):
         """ bool: Whether the server for this app is up and responsive. """
 
-        if self.server_thread and self.server_thread.join(0):
+        if self.port is None:
             return False
 
         try:
@@ -122,23 +358,61 @@ class Server(object):
     def has_pending_requests(self):
         return self.middleware.has_pending_requests
 
+    @property
+    def pending_requests(self):
+        """
+        List[Tuple[str, float]]: The method and path of each request in flight, with the number of
+        seconds it has been running, longest-running first.
+        """
+
+        return self.middleware.pending_requests
+
 
 class Middleware(object):
-    def __init__(self, app):
+    def __init__(self, app, static_paths=None):
         self.app = app
         self.counter = Counter()
         self.error = None
+        self.stats = RequestStats()
+        self.static_assets = StaticAssets(static_paths) if static_paths else None
+        self._requests_lock = Lock()
+        self._requests = {}
+        self._last_active = monotonic()
 
     def __call__(self, environ, start_response):
         if environ["PATH_INFO"] == "/__identify__":
             return self.identify(environ, start_response)
-        else:
-            with self.counter:
+
+        request = "{0} {1}".format(environ.get("REQUEST_METHOD", "GET"), environ["PATH_INFO"])
+        start = monotonic()
+        statuses = []
+
+        def record(size):
+            status = int(statuses[-1].split()[0]) if statuses else 500
+            self.stats.record(request, status, monotonic() - start, size)
+
+        def recording_start_response(status, headers, *args):
+            statuses.append(status)
+            return start_response(status, headers, *args)
+
+        try:
+            with self.counter, self._track(request):
                 try:
-                    return self.app(environ, start_response)
+                    response = self._serve(environ, recording_start_response)
+                    return _RecordingResponse(response, record)
                 except Exception as e:
                     self.error = e
                     raise
+        except Exception:
+            record(0)
+            raise
+
+    def _serve(self, environ, start_response):
+        if self.static_assets:
+            response = self.static_assets(environ, start_response)
+            if response is not None:
+                return response
+        return self.app(environ, start_response)
 
     def identify(self, environ, start_response):
         start_response("200 OK", [("Content-Type", "text/plain")])
@@ -147,3 +421,296 @@ class Middleware(object):
     @property
     def has_pending_requests(self):
         return self.counter.value > 0
+
+    @property
+    def idle_time(self):
+        with self._requests_lock:
+            return 0 if self._requests else monotonic() - self._last_active
+
+    @property
+    def pending_requests(self):
+        now = monotonic()
+        with self._requests_lock:
+            requests = sorted(self._requests.values(), key=lambda request: request[1])
+        return [(request, now - start) for request, start in requests]
+
+    @contextmanager
+    def _track(self, request):
+        key = object()
+        with self._requests_lock:
+            self._requests[key] = (request, monotonic())
+        try:
+            yield
+        finally:
+            with self._requests_lock:
+                del self._requests[key]
+                self._last_active = monotonic()
+
+
+class Router(object):
+    """
+    A WSGI-compliant app that routes requests to the apps mounted on it, so that a single server
+    can serve them all.
+
+    Args:
+        routing (str): How to route requests: by ``"host"``, where each app is served on its own
+            subdomain, or by ``"path"``, where each app is served under its own path prefix.
+        domain (str, optional): The domain whose subdomains apps are served on when routing by
+            host. Defaults to ``"localhost"``.
+    """
+
+    def __init__(self, routing, domain="localhost"):
+        self.routing = routing
+        self.domain = domain
+        self._lock = Lock()
+        self._apps = {}
+        self._mounts = 0
+
+    def mount(self, app):
+        """
+        Mounts the given app.
+
+        Args:
+            app (object): The WSGI-compliant app to mount.
+
+        Returns:
+            str: The name of the subdomain or path prefix the app is mounted on.
+        """
+
+        with self._lock:
+            self._mounts += 1
+            name = "app{0}".format(self._mounts)
+            self._apps[name] = app
+        return name
+
+    def unmount(self, name):
+        with self._lock:
+            self._apps.pop(name, None)
+
+    def __call__(self, environ, start_response):
+        if self.routing == "host":
+            host = environ.get("HTTP_HOST", "").split(":")[0]
+            suffix = "." + self.domain
+            name = host[:-len(suffix)] if host.endswith(suffix) else None
+        else:
+            segments = environ["PATH_INFO"].split("/", 2)
+            name = segments[1]
+
+            environ = dict(environ)
+            environ["SCRIPT_NAME"] = environ.get("SCRIPT_NAME", "") + "/" + name
+            environ["PATH_INFO"] = "/" + (segments[2] if len(segments) > 2 else "")
+
+        with self._lock:
+            app = self._apps.get(name)
+
+        if app is None:
+            start_response("404 Not Found", [("Content-Type", "text/plain")])
+            return [encode_string("No app is mounted here.")]
+
+        return app(environ, start_response)
+
+
+class _RecordingResponse(object):
+    """ Wraps a WSGI response, reporting the size of its body once it is closed. """
+
+    def __init__(self, response, record):
+        self.response = response
+        self.record = record
+        self.size = 0
+
+    def __iter__(self):
+        for chunk in self.response:
+            self.size += len(chunk)
+            yield chunk
+
+    def close(self):
+        try:
+            if hasattr(self.response, "close"):
+                self.response.close()
+        finally:
+            self.record(self.size)
+
+
+class RequestStats(object):
+    """
+    Collects the latency, response sizes, and statuses of requests, by method and path.
+
+    Recording a request only takes a lock long enough to update a few counters, so that it adds
+    little to each request.
+    """
+
+    buckets = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5]
+    """ List[float]: The upper bounds, in seconds, of the latency histogram's buckets. """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._routes = {}
+
+    def record(self, request, status, seconds, size):
+        """
+        Records a finished request.
+
+        Args:
+            request (str): The method and path of the request, e.g., ``"GET /foo"``.
+            status (int): The response status code.
+            seconds (float): How long the request took.
+            size (int): The size of the response body in bytes.
+        """
+
+        bucket = bisect_left(self.buckets, seconds)
+        with self._lock:
+            route = self._routes.get(request)
+            if route is None:
+                route = self._routes[request] = _RouteStats(self.buckets)
+            route.count += 1
+            route.seconds += seconds
+            route.max_seconds = max(route.max_seconds, seconds)
+            route.size += size
+            route.histogram[bucket] += 1
+            route.statuses[status] = route.statuses.get(status, 0) + 1
+
+    def reset(self):
+        """ Forgets all recorded requests. """
+        with self._lock:
+            self._routes = {}
+
+    def snapshot(self):
+        """
+        Returns the stats of the requests recorded so far.
+
+        Returns:
+            Dict[str, Dict[str, object]]: The stats of each method and path, with the number of
+                requests (``count``), their total and maximum durations in seconds (``seconds`` and
+                ``max_seconds``), the total size of their responses in bytes (``size``), the
+                number of requests for each status code (``statuses``), and the number of requests
+                that took up to each of :attr:`buckets`, plus those that took longer
+                (``histogram``).
+        """
+
+        with self._lock:
+            return dict((request, route.snapshot()) for request, route in self._routes.items())
+
+
+class _RouteStats(object):
+    def __init__(self, buckets):
+        self.count = 0
+        self.seconds = 0
+        self.max_seconds = 0
+        self.size = 0
+        self.histogram = [0] * (len(buckets) + 1)
+        self.statuses = {}
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "seconds": self.seconds,
+            "max_seconds": self.max_seconds,
+            "size": self.size,
+            "statuses": dict(self.statuses),
+            "histogram": list(self.histogram)}
+
+
+_StaticAsset = namedtuple("_StaticAsset", ["body", "gzipped_body", "etag", "content_type", "mtime"])
+
+
+class StaticAssets(object):
+    """
+    Serves static files from memory, bypassing the app.
+
+    Files are read on their first request and cached, along with a gzipped copy of those worth
+    compressing, until they change on disk. Responses carry an ETag, so browsers can revalidate
+    their copies without downloading them again.
+
+    Args:
+        paths (Dict[str, str]): The directories to serve files from, keyed by URL prefix.
+    """
+
+    compressible_types = ["application/javascript", "application/json", "image/svg+xml"]
+    """ List[str]: The non-text content types worth compressing. """
+
+    min_compressible_size = 256
+    """ int: The size in bytes below which files aren't worth compressing. """
+
+    def __init__(self, paths):
+        self.paths = dict((prefix.rstrip("/") + "/", os.path.abspath(directory))
+                          for prefix, directory in paths.items())
+        self._lock = Lock()
+        self._assets = {}
+
+    def __call__(self, environ, start_response):
+        """
+        Serves the requested file, if it is a static asset.
+
+        Returns:
+            List[bytes] | None: The response body, or None if the request isn't for an asset.
+        """
+
+        if environ.get("REQUEST_METHOD", "GET") not in ["GET", "HEAD"]:
+            return None
+
+        filename = self._filename(environ["PATH_INFO"])
+        asset = filename and self._load(filename)
+        if not asset:
+            return None
+
+        headers = [("ETag", asset.etag), ("Cache-Control", "no-cache")]
+
+        etags = [etag.strip() for etag in environ.get("HTTP_IF_NONE_MATCH", "").split(",")]
+        if asset.etag in etags:
+            start_response("304 Not Modified", headers)
+            return []
+
+        body = asset.body
+        if asset.gzipped_body is not None:
+            headers.append(("Vary", "Accept-Encoding"))
+            if "gzip" in environ.get("HTTP_ACCEPT_ENCODING", ""):
+                body = asset.gzipped_body
+                headers.append(("Content-Encoding", "gzip"))
+
+        headers += [("Content-Type", asset.content_type), ("Content-Length", str(len(body)))]
+        start_response("200 OK", headers)
+        return [] if environ.get("REQUEST_METHOD") == "HEAD" else [body]
+
+    def _filename(self, path):
+        for prefix, directory in self.paths.items():
+            if path.startswith(prefix):
+                filename = os.path.abspath(os.path.join(directory, path[len(prefix):]))
+                # Don't serve files outside the directory, e.g., for paths containing "..".
+                if filename.startswith(directory + os.sep) and os.path.isfile(filename):
+                    return filename
+        return None
+
+    def _load(self, filename):
+        mtime = os.path.getmtime(filename)
+
+        with self._lock:
+            asset = self._assets.get(filename)
+        if asset and asset.mtime == mtime:
+            return asset
+
+        with open(filename, "rb") as f:
+            body = f.read()
+
+        content_type = guess_type(filename)[0] or "application/octet-stream"
+        asset = _StaticAsset(
+            body=body,
+            gzipped_body=self._compress(body) if self._compressible(content_type, body) else None,
+            etag='"{0}"'.format(md5(body).hexdigest()),
+            content_type=content_type,
+            mtime=mtime)
+
+        with self._lock:
+            self._assets[filename] = asset
+        return asset
+
+    def _compressible(self, content_type, body):
+        return (
+            len(body) >= self.min_compressible_size and
+            (content_type.startswith("text/") or content_type in self.compressible_types))
+
+    @staticmethod
+    def _compress(body):
+        buffer = BytesIO()
+        with GzipFile(fileobj=buffer, mode="wb", mtime=0) as f:
+            f.write(body)
+        return buffer.getvalue()
@@ -4,11 +4,14 @@ from datetime import datetime
 from functools import wraps
 import os
 import random
+from threading import local
+from time import sleep
 
 import capybara
 from capybara.compat import ParseResult, urlparse
 from capybara.driver.node import Node
-from capybara.exceptions import ScopeError, WindowError
+from capybara.exceptions import ExpectationNotMet, ScopeError, WindowError
+from capybara.helpers import BackgroundCall, desc, monotonic, Timer, toregex
 from capybara.node.base import Base
 from capybara.node.document import Document
 from capybara.node.element import Element
@@ -37,8 +40,8 @@ _SESSION_METHODS = [
     "assert_no_current_path", "dismiss_confirm", "dismiss_prompt", "evaluate_async_script",
     "evaluate_script", "execute_script", "fieldset", "frame", "go_back", "go_forward",
     "has_current_path", "has_no_current_path", "open_new_window", "refresh", "reset", "save_page",
-    "save_screenshot", "scope", "switch_to_frame", "switch_to_window", "table", "visit", "window",
-    "window_opened_by"]
+    "save_screenshot", "scope", "switch_to_frame", "switch_to_window", "table", "visit",
+    "wait_for_network_idle", "window", "window_opened_by"]
 _SESSION_PROPERTIES = ["current_host", "current_path", "current_url", "current_window", "windows"]
 
 DSL_METHODS = _DOCUMENT_METHODS + _NODE_METHODS + _SESSION_METHODS
@@ -75,19 +78,60 @@ class Session(SessionMatchersMixin, object):
     def __init__(self, mode, app):
         self.mode = mode
         self.app = app
-        self.server = Server(app).boot() if app and self.driver.needs_server else None
-        self.synchronized = False
+        self._pending_reset = None
+        self._driver.prepare()
+        self.server = Server(app).boot() if app and self._driver.needs_server else None
+        self._local = local()
+        self._dirty = False
         self._scopes = [None]
+        self._window_snapshot = {}
 
-    @cached_property
+    @property
     def driver(self):
         """ driver.Base: The driver for the current session. """
-        return capybara.drivers[self.mode](self.app)
+        self._use()
+        return self._driver
 
     @cached_property
+    def _driver(self):
+        return capybara.drivers[self.mode](self.app)
+
+    @property
     def document(self):
         """ Document: The document for the current page. """
-        return Document(self, self.driver)
+        self._use()
+        return self._document
+
+    @cached_property
+    def _document(self):
+        return Document(self, self._driver)
+
+    @property
+    def synchronized(self):
+        """
+        bool: Whether the current thread is already within a synchronized call on this session, so
+        that nested calls don't retry on their own.
+        """
+        return getattr(self._local, "synchronized", False)
+
+    @synchronized.setter
+    def synchronized(self, value):
+        self._local.synchronized = value
+
+    @property
+    def dirty(self):
+        """ bool: Whether the session has been used since it was last reset. """
+        return self._dirty
+
+    def _use(self):
+        self._finish_reset()
+        self._dirty = True
+
+    def _finish_reset(self):
+        # Finish resetting the session before it is used again.
+        if self._pending_reset:
+            pending_reset, self._pending_reset = self._pending_reset, None
+            pending_reset.join()
 
     @property
     def current_scope(self):
@@ -115,9 +159,32 @@ class Session(SessionMatchersMixin, object):
         if not self.current_url:
             return
 
-        path = urlparse(self.current_url).path
+        path = self._app_path(urlparse(self.current_url))
         return path if path else None
 
+    def _app_path(self, url):
+        """
+        Returns the path of the given URL within the app, without the path prefix under which the
+        server may serve it.
+
+        Args:
+            url (ParseResult): The URL whose path to return.
+
+        Returns:
+            str: The path within the app.
+        """
+
+        path = url.path
+
+        if self.server and not capybara.app_host:
+            base = urlparse(self.server.url)
+            if base.path and url.netloc == base.netloc and (
+                path == base.path or path.startswith(base.path + "/")
+            ):
+                path = path[len(base.path):] or "/"
+
+        return path
+
     @property
     def current_host(self):
         """ str: Host of the current page. """
@@ -159,17 +226,23 @@ class Session(SessionMatchersMixin, object):
 
         visit_uri = urlparse(visit_uri)
 
+        path = visit_uri.path
+
         if capybara.app_host:
             uri_base = urlparse(capybara.app_host)
         elif self.server:
-            uri_base = urlparse("http://{}:{}".format(self.server.host, self.server.port))
+            uri_base = urlparse(self.server.url)
+
+            # Servers may serve the app under a path prefix.
+            if not visit_uri.netloc and (not path or path.startswith("/")):
+                path = uri_base.path + path
         else:
             uri_base = None
 
         visit_uri = ParseResult(
             scheme=visit_uri.scheme or (uri_base.scheme if uri_base else ""),
             netloc=visit_uri.netloc or (uri_base.netloc if uri_base else ""),
-            path=visit_uri.path,
+            path=path,
             params=visit_uri.params,
             query=visit_uri.query,
             fragment=visit_uri.fragment)
@@ -339,15 +412,29 @@ class Session(SessionMatchersMixin, object):
                 "You must provide a frame element, \"parent\", or \"top\" "
                 "when calling switch_to_frame")
 
-    def switch_to_window(self, window, wait=None):
+    def switch_to_window(self, window=None, wait=None, title=None, url=None):
         """
         If ``window`` is a lambda, it switches to the first window for which ``window`` returns a
         value other than False or None. If a window that matches can't be found, the window will be
         switched back and :exc:`WindowError` will be raised.
 
+        Instead of a lambda, the desired window can be described by its ``title`` and/or ``url``. ::
+
+            session.switch_to_window(title="Title of the first popup")
+            session.switch_to_window(url=re.compile(r"/popup_\\w+$"))
+
+        These are matched against a snapshot of the open windows which, apart from the current
+        window, is only refreshed for windows which have just been opened or are still loading. This
+        avoids switching to every window on every attempt while waiting for a matching window.
+        Windows whose title or URL is changed by script after loading should be matched with a
+        lambda instead.
+
         Args:
-            window (Window | lambda): The window that should be switched to, or a filtering lambda.
+            window (Window | lambda, optional): The window that should be switched to, or a
+                filtering lambda.
             wait (int | float, optional): The number of seconds to wait to find the window.
+            title (str | RegexObject, optional): Text that the title of the window should contain.
+            url (str | RegexObject, optional): Text that the URL of the window should contain.
 
         Returns:
             Window: The new current window.
@@ -355,7 +442,7 @@ class Session(SessionMatchersMixin, object):
         Raises:
             ScopeError: If this method is invoked inside :meth:`scope, :meth:`frame`, or
                 :meth:`window`.
-            WindowError: If no window matches the given lambda.
+            WindowError: If no window matches the given lambda, title, or URL.
         """
 
         if len(self._scopes) > 1:
@@ -364,8 +451,37 @@ class Session(SessionMatchersMixin, object):
                 "within `scope`s, `frame`s, or other `window`s.")
 
         if isinstance(window, Window):
+            # The windows we leave behind may have changed while we were using them.
+            self._window_snapshot = {}
             self.driver.switch_to_window(window.handle)
             return window
+        elif window is None:
+            if title is None and url is None:
+                raise ValueError(
+                    "You must provide a window, a lambda, a title, or a URL "
+                    "when calling switch_to_window")
+
+            title_regex = toregex(title) if title is not None else None
+            url_regex = toregex(url) if url is not None else None
+
+            @self.document.synchronize(errors=(WindowError,), wait=wait)
+            def switch_to_matching_window():
+                for handle, metadata in self._window_metadata():
+                    if title_regex and not title_regex.search(metadata["title"] or ""):
+                        continue
+                    if url_regex and not url_regex.search(metadata["url"] or ""):
+                        continue
+                    self.driver.switch_to_window(handle)
+                    return Window(self, handle)
+
+                criteria = []
+                if title is not None:
+                    criteria.append("title {}".format(desc(title)))
+                if url is not None:
+                    criteria.append("URL {}".format(desc(url)))
+                raise WindowError("Could not find a window with {}".format(" and ".join(criteria)))
+
+            return switch_to_matching_window()
         else:
             @self.document.synchronize(errors=(WindowError,), wait=wait)
             def switch_and_get_matching_window():
@@ -385,6 +501,33 @@ class Session(SessionMatchersMixin, object):
 
             return switch_and_get_matching_window()
 
+    def _window_metadata(self):
+        """
+        Returns a snapshot of the title and URL of each open window. Only the current window,
+        windows which have been opened since the last snapshot, and windows which were still
+        loading are described again.
+
+        Returns:
+            List[Tuple[object, Dict[str, str | bool]]]: The handle and metadata of each window.
+        """
+
+        handles = self.driver.window_handles
+        current_handle = self.driver.current_window_handle
+        snapshot = self._window_snapshot
+
+        stale_handles = [
+            handle for handle in handles
+            if handle == current_handle or
+            handle not in snapshot or
+            not snapshot[handle]["loaded"]]
+
+        # Forget about closed windows.
+        snapshot = {handle: snapshot[handle] for handle in handles if handle in snapshot}
+        snapshot.update(self.driver.window_metadata(stale_handles))
+        self._window_snapshot = snapshot
+
+        return [(handle, snapshot[handle]) for handle in handles if handle in snapshot]
+
     @contextmanager
     def window(self, window):
         """
@@ -622,6 +765,30 @@ class Session(SessionMatchersMixin, object):
         self.driver.save_screenshot(path, **kwargs)
         return path
 
+    def wait_for_network_idle(self, idle_for=0.1, timeout=None):
+        """
+        Waits until neither the server nor the page have had any requests in flight for the given
+        number of seconds. The server's requests are only tracked when Capybara serves the app, and
+        the page's requests only when the driver can track them. ::
+
+            session.click_button("Load more")
+            session.wait_for_network_idle()
+
+        Args:
+            idle_for (int | float, optional): The number of seconds the network must stay idle.
+                Defaults to 0.1.
+            timeout (int | float, optional): The maximum number of seconds to wait. Defaults to
+                :data:`capybara.default_max_wait_time`.
+
+        Raises:
+            ExpectationNotMet: If the network doesn't become idle in time.
+        """
+
+        seconds = timeout if timeout is not None else capybara.default_max_wait_time
+        if not self._wait_for_network_idle(idle_for, Timer(seconds)):
+            raise ExpectationNotMet(
+                "network did not become idle within {} seconds".format(seconds))
+
     def reset(self):
         """
         Reset the session (i.e., remove cookies and navigate to a blank page).
@@ -638,13 +805,36 @@ class Session(SessionMatchersMixin, object):
         teardown method.
         """
 
-        self.driver.reset()
+        self._finish_reset()
+        self._window_snapshot = {}
+        self._driver.reset()
+        self._dirty = False
+        self._finish_requests()
+
+    def reset_in_background(self):
+        """
+        Resets the session like :meth:`reset`, but resets the driver on a background thread. The
+        server's requests in flight are still waited for, and any server error raised, right away.
+        The driver reset finishes when the session is next used.
+        """
+
+        self._finish_reset()
+        self._window_snapshot = {}
+        self._dirty = False
+        try:
+            self._finish_requests()
+        finally:
+            self._pending_reset = BackgroundCall(self._driver.reset)
+
+    def _finish_requests(self):
         if self.server:
             self.server.wait_for_pending_requests()
         self.raise_server_error()
 
     def raise_server_error(self):
         """ Raise errors encountered by the server. """
+        # Let a pending reset finish, so that the errors of its requests aren't missed.
+        self._finish_reset()
         if self.server and self.server.error:
             try:
                 if capybara.raise_server_errors:
@@ -658,6 +848,48 @@ class Session(SessionMatchersMixin, object):
     reset_session = reset
     """ Alias for :meth:`reset`. """
 
+    @property
+    def _network_busy(self):
+        """ bool: Whether the server or the page have any requests in flight. """
+        return bool(
+            (self.server and self.server.has_pending_requests) or self.driver.pending_requests)
+
+    def _wait_for_network_idle(self, idle_for, timer, retry_policy=None):
+        """
+        Waits until the network has been idle for the given number of seconds. Waits for the
+        server's requests without polling, and polls the page at the retry policy's delay.
+
+        Args:
+            idle_for (int | float): The number of seconds the network must stay idle.
+            timer (Timer): The timer limiting how long to wait.
+            retry_policy (RetryPolicy, optional): The policy deciding how long to wait between
+                checks of the page. Defaults to :data:`capybara.retry_policy`.
+
+        Returns:
+            bool: Whether the network became idle before the timer expired.
+        """
+
+        policy = retry_policy or capybara.retry_policy
+        idle_since = None
+        retries = 0
+        while True:
+            if self.server and self.server.has_pending_requests:
+                idle_since = None
+                self.server.middleware.counter.wait_for_zero(timer.remaining)
+            elif self.driver.pending_requests:
+                idle_since = None
+                retries += 1
+                sleep(min(policy.delay(retries), timer.remaining))
+            else:
+                now = monotonic()
+                if idle_since is None:
+                    idle_since = now
+                if now - idle_since >= idle_for:
+                    return True
+                sleep(min(idle_since + idle_for - now, timer.remaining))
+            if timer.expired:
+                return False
+
     def _wrap_element_script_result(self, arg):
         if isinstance(arg, list):
             return [self._wrap_element_script_result(e) for e in arg]
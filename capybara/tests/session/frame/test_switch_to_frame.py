@@ -41,6 +41,17 @@ class TestSwitchToFrame:
         session.switch_to_frame(frame)
         assert session.has_selector("css", "#divInFrameOne", text="This is the text of divInFrameOne")
 
+    def test_returns_to_the_immediate_parent_of_a_nested_frame(self, session):
+        frame = session.find("frame", "parentFrame")
+        session.switch_to_frame(frame)
+        frame = session.find("frame", "childFrame")
+        session.switch_to_frame(frame)
+        session.switch_to_frame("parent")
+        assert session.has_selector("css", "body#parentBody")
+        session.switch_to_frame("parent")
+        assert session.find("//*[@id='divInMainWindow']").text == (
+            "This is the text for divInMainWindow")
+
     def test_resets_scope_when_changing_frames(self, session):
         frame = session.find("frame", "parentFrame")
         with session.scope("css", "#divInMainWindow"):
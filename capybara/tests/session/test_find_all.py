@@ -17,6 +17,11 @@ class TestFindAll(FindAllTestCase):
         assert session.find_all("//h1")[0].text == "This is a test"
         assert session.find_all("//input[@id='test_field']")[0].value == "monkey"
 
+    def test_returns_the_elements_found_before_navigating_away(self, session):
+        result = session.find_all("css", "p", visible="all", minimum=1)
+        session.visit("/form")
+        assert len(result) == 3
+
     def test_returns_an_empty_result_when_nothing_was_found(self, session):
         assert len(session.find_all("//div[@id='nosuchthing']")) == 0
 
@@ -5,6 +5,8 @@ from time import sleep
 import capybara
 from capybara.exceptions import ReadOnlyElementError
 from capybara.node.element import Element
+from capybara.node.finders import FindersMixin
+from capybara.tests.compat import patch
 from capybara.tests.helpers import extract_results, isfirefox, ismarionette, ismarionettelt
 
 
@@ -449,6 +451,48 @@ class TestNodeEvaluateAsyncScript(NodeTestCase):
         assert el == change
 
 
+class TestNodeReloadWithRelocator(NodeTestCase):
+    def test_finds_the_node_again_without_rerunning_its_queries(self, session):
+        node = session.find("css", "#first").find("css", "a", text="ullamco")
+        session.visit("/with_html")
+        with patch.object(FindersMixin, "find_first") as find_first:
+            assert node.reload().text == "ullamco"
+        assert not find_first.called
+        assert node == session.find("css", "#foo")
+
+    @pytest.mark.requires("js")
+    def test_finds_the_node_again_without_reloading_its_scope(self, session):
+        node = session.find("css", "#first").find("css", "a", text="ullamco")
+        with patch.object(node.query_scope, "reload") as reload:
+            assert node.reload().text == "ullamco"
+        assert not reload.called
+
+    def test_reruns_its_queries_when_the_node_cannot_be_found_again(self, session):
+        node = session.find("css", "#first").find("css", "a", text="ullamco")
+        session.visit("/with_simple_html")
+        with patch.object(FindersMixin, "find_first", return_value=None) as find_first:
+            node.reload()
+        assert find_first.called
+
+    @pytest.mark.parametrize("selector, locator", [
+        ("css", "#first"),
+        ("xpath", "//p[@id='first']")])
+    def test_reruns_its_queries_when_the_node_found_again_no_longer_matches(
+        self, session, selector, locator
+    ):
+        node = session.find(selector, locator)
+        session.visit("/with_count")
+        with patch.object(FindersMixin, "find_first", return_value=None) as find_first:
+            node.reload()
+        assert find_first.called
+
+    def test_reruns_its_queries_when_the_node_found_again_is_outside_its_scope(self, session):
+        node = session.find("css", "#first").find("css", "a", match="first")
+        # As if the relocator now led to a matching node in another part of the page.
+        node.base = session.find("css", "#red").base
+        assert node.reload().text == "labore"
+
+
 @pytest.mark.requires("js")
 class TestNodeReloadWithoutAutomaticReload(NodeTestCase):
     @pytest.fixture(autouse=True)
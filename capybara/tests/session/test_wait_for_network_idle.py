@@ -0,0 +1,35 @@
+import pytest
+
+import capybara
+from capybara.exceptions import ExpectationNotMet
+
+
+class TestWaitForNetworkIdle:
+    def test_returns_when_nothing_is_in_flight(self, session):
+        session.visit("/with_html")
+        session.wait_for_network_idle()
+
+    @pytest.mark.requires("js")
+    def test_waits_for_requests_made_by_the_page(self, session):
+        session.visit("/with_js")
+        session.click_button("Fire Ajax Request")
+        session.wait_for_network_idle(timeout=5)
+        assert session.has_selector("css", "#ajax_request_done", wait=0)
+
+    @pytest.mark.requires("js")
+    def test_raises_an_error_if_the_network_does_not_become_idle_in_time(self, session):
+        session.visit("/with_js")
+        session.click_button("Fire Ajax Request")
+        with pytest.raises(ExpectationNotMet) as excinfo:
+            session.wait_for_network_idle(timeout=0.5)
+        assert "network did not become idle within 0.5 seconds" in str(excinfo.value)
+
+    @pytest.mark.requires("js")
+    def test_retries_queries_once_requests_finish(self, session):
+        session.visit("/with_js")
+        session.click_button("Fire Ajax Request")
+        capybara.synchronize_with_network = True
+        try:
+            assert session.has_selector("css", "#ajax_request_done", wait=5)
+        finally:
+            capybara.synchronize_with_network = False
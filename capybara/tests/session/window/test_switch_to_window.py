@@ -1,4 +1,5 @@
 import pytest
+import re
 from time import sleep
 
 from capybara.exceptions import ScopeError, WindowError
@@ -33,6 +34,11 @@ class TestSwitchToWindow(SwitchToWindowTestCase):
         session.switch_to_window(
             lambda: session.title == "Title of the first popup", wait=5)
 
+    def test_waits_for_window_with_title_to_appear(self, session):
+        session.find("css", "#openWindowWithTimeout").click()
+        session.switch_to_window(title="Title of the first popup", wait=5)
+        assert session.has_css("#divInPopupOne")
+
 
 class TestSwitchToWindowWithWindow(SwitchToWindowTestCase):
     def test_switches_to_a_window(self, session):
@@ -109,3 +115,42 @@ class TestSwitchToWindowWithLambda(SwitchToWindowTestCase):
             session.switch_to_window(failed_check)
         assert "error" in str(excinfo.value)
         assert session.current_window == original
+
+class TestSwitchToWindowWithTitleOrUrl(SwitchToWindowTestCase):
+    @pytest.fixture(autouse=True)
+    def setup_windows(self, session):
+        session.find("css", "#openTwoWindows").click()
+        sleep(1)  # wait for the windows to open
+
+    def test_switches_to_the_window_with_the_given_title(self, session):
+        session.switch_to_window(title="Title of popup two")
+        assert session.has_css("#divInPopupTwo")
+
+    def test_switches_to_the_window_with_the_given_url(self, session):
+        session.switch_to_window(url="/popup_one")
+        assert session.has_css("#divInPopupOne")
+
+    def test_switches_to_the_window_matching_a_regex(self, session):
+        session.switch_to_window(url=re.compile(r"/popup_two$"))
+        assert session.has_css("#divInPopupTwo")
+
+    def test_switches_multiple_times(self, session):
+        session.switch_to_window(title="Title of the first popup")
+        assert session.has_css("#divInPopupOne")
+        session.switch_to_window(title="Title of popup two")
+        assert session.has_css("#divInPopupTwo")
+        session.switch_to_window(title="With Windows")
+        assert session.has_css("#openTwoWindows")
+
+    def test_returns_the_window(self, session, initial_window):
+        window = session.switch_to_window(title="Title of popup two")
+        assert window in set(session.windows) - set([initial_window])
+        assert window.current
+
+    def test_raises_error_if_no_window_matches(self, session):
+        original = session.current_window
+        with pytest.raises(WindowError) as excinfo:
+            session.switch_to_window(title="A title", url="/popup_one")
+        assert "Could not find a window with title 'A title' and URL '/popup_one'" in str(
+            excinfo.value)
+        assert session.current_window == original
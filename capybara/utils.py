@@ -1,5 +1,5 @@
-from socket import socket
-from threading import Lock
+from socket import AF_INET, AF_INET6, SO_REUSEADDR, SOL_SOCKET, socket
+from threading import Condition
 
 from capybara.compat import (
     ParseResult,
@@ -38,7 +38,7 @@ class Counter(object):
     """ Keeps track of a running count. """
 
     def __init__(self):
-        self._lock = Lock()
+        self._condition = Condition()
         self._value = 0
 
     @property
@@ -46,13 +46,41 @@ class Counter(object):
         """ int: The current value of the counter. """
         return self._value
 
+    def wait_for_zero(self, timeout=None):
+        """
+        Waits until the count drops to zero, without polling.
+
+        Args:
+            timeout (int | float, optional): The maximum number of seconds to wait. Defaults to
+                None, meaning no limit.
+
+        Returns:
+            bool: Whether the count dropped to zero before the timeout.
+        """
+
+        from capybara.helpers import monotonic
+
+        with self._condition:
+            end = None if timeout is None else monotonic() + timeout
+            while self._value:
+                if end is None:
+                    self._condition.wait()
+                else:
+                    remaining = end - monotonic()
+                    if remaining <= 0:
+                        return False
+                    self._condition.wait(remaining)
+            return True
+
     def __enter__(self):
-        with self._lock:
+        with self._condition:
             self._value += 1
 
     def __exit__(self, *args):
-        with self._lock:
+        with self._condition:
             self._value -= 1
+            if not self._value:
+                self._condition.notify_all()
 
 
 def decode_bytes(value):
@@ -65,6 +93,25 @@ def encode_string(value):
     return value.encode("utf-8") if isstring(value) else value
 
 
+def bind_socket(host, port=0):
+    """
+    Binds a listening socket to the given host and port.
+
+    Args:
+        host (str): The IP address to bind.
+        port (int, optional): The port to bind. Defaults to 0, meaning a random available port.
+
+    Returns:
+        socket: The listening socket.
+    """
+
+    s = socket(AF_INET6 if ":" in host else AF_INET)
+    s.setsockopt(SOL_SOCKET, SO_REUSEADDR, 1)
+    s.bind((host, port))
+    s.listen(128)
+    return s
+
+
 def find_available_port():
     """ int: A random available port. """
     s = socket()
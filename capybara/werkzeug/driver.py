@@ -19,6 +19,10 @@ class Driver(Base):
             self._browser = Browser(self)
         return self._browser
 
+    @property
+    def is_static(self):
+        return True
+
     @property
     def current_url(self):
         return self.browser.current_url
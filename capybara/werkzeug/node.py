@@ -67,6 +67,10 @@ class Node(Base):
     def path(self):
         return self._string_node.path
 
+    @property
+    def relocator(self):
+        return self.path
+
     @property
     def checked(self):
         return self._string_node.checked
@@ -0,0 +1,104 @@
+from socket import SHUT_RDWR, error as SocketError
+from threading import Lock, Thread
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
+
+from capybara.compat import Queue
+
+
+class KeepAliveRequestHandler(WSGIRequestHandler):
+    """
+    Handles requests over persistent HTTP/1.1 connections.
+
+    Connections are closed after sitting idle for :attr:`timeout` seconds, so that idle browser
+    connections don't tie up the server's workers for long.
+    """
+
+    protocol_version = "HTTP/1.1"
+    timeout = 2
+
+    # Responses are written in several small pieces, which Nagle's algorithm would otherwise hold
+    # back until the client acknowledges the previous ones.
+    disable_nagle_algorithm = True
+
+
+class PooledWSGIServer(BaseWSGIServer):
+    """
+    A WSGI server that handles connections on a fixed number of worker threads.
+
+    Args:
+        host (str): The IP address to bind.
+        port (int): The port to bind.
+        app (object): The WSGI-compliant app to serve.
+        threads (int, optional): The number of worker threads, and thus of connections handled at
+            once. Further connections wait for a free worker. Defaults to 16.
+        fd (int, optional): The file descriptor of a listening socket to serve, instead of binding
+            a new one.
+    """
+
+    multithread = True
+
+    def __init__(self, host, port, app, threads=16, fd=None):
+        assert threads >= 1, "threads should be at least 1"
+
+        super(PooledWSGIServer, self).__init__(
+            host, port, app, handler=KeepAliveRequestHandler, fd=fd)
+
+        self.threads = threads
+        self._connections = Queue()
+        self._active = set()
+        self._active_lock = Lock()
+        self._closed = False
+        self._workers = []
+        for _ in range(threads):
+            worker = Thread(target=self._work)
+
+            # Inform Python that it shouldn't wait for worker threads to terminate before
+            # exiting. (They will still be appropriately terminated when the process exits.)
+            worker.daemon = True
+
+            worker.start()
+            self._workers.append(worker)
+
+    def process_request(self, request, client_address):
+        self._connections.put((request, client_address))
+
+    def server_close(self):
+        """ Stops listening, closes all connections, and stops the worker threads. """
+
+        super(PooledWSGIServer, self).server_close()
+
+        with self._active_lock:
+            self._closed = True
+            for request in self._active:
+                # Wake workers waiting for idle connections to send another request.
+                try:
+                    request.shutdown(SHUT_RDWR)
+                except SocketError:
+                    pass
+
+        for _ in self._workers:
+            self._connections.put(None)
+        for worker in self._workers:
+            worker.join()
+
+    def _work(self):
+        while True:
+            connection = self._connections.get()
+            if connection is None:
+                return
+
+            request, client_address = connection
+            with self._active_lock:
+                if self._closed:
+                    self.shutdown_request(request)
+                    continue
+                self._active.add(request)
+
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                with self._active_lock:
+                    self._active.discard(request)
+                self.shutdown_request(request)
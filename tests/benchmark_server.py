@@ -0,0 +1,105 @@
+"""
+Compares page-load times of an asset-heavy page served by each of Capybara's servers.
+
+Run it with ``python -m tests.benchmark_server``. By default, pages are loaded by Selenium, which
+needs a browser. Pass ``--client http`` to instead fetch each page and its assets over six
+connections at a time, as a browser would, without one.
+"""
+
+from argparse import ArgumentParser
+from threading import Thread
+
+import capybara
+from capybara.compat import HTTPConnection, Queue
+from capybara.helpers import monotonic
+from capybara.server import Server
+from capybara.session import Session
+from capybara.utils import encode_string
+
+
+ASSETS = ["/assets/{0}.png".format(i) for i in range(40)]
+PAGE = encode_string("<html><body>{0}</body></html>".format(
+    "".join('<img src="{0}">'.format(asset) for asset in ASSETS)))
+ASSET = b"\x89PNG" + b"\x00" * 2048
+
+
+def app(environ, start_response):
+    if environ["PATH_INFO"] == "/":
+        body, content_type = PAGE, "text/html"
+    else:
+        body, content_type = ASSET, "image/png"
+    start_response("200 OK", [("Content-Type", content_type), ("Content-Length", str(len(body)))])
+    return [body]
+
+
+def load_with_http(server):
+    paths = Queue()
+    for asset in ASSETS:
+        paths.put(asset)
+
+    def fetch(connection, path):
+        connection.request("GET", path)
+        connection.getresponse().read()
+
+    def fetch_assets():
+        connection = HTTPConnection(server.host, server.port)
+        try:
+            while not paths.empty():
+                fetch(connection, paths.get())
+        finally:
+            connection.close()
+
+    connection = HTTPConnection(server.host, server.port)
+    try:
+        fetch(connection, "/")
+    finally:
+        connection.close()
+
+    # Browsers open up to six connections per host.
+    threads = [Thread(target=fetch_assets) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def benchmark(server_name, client, loads):
+    # Serve a distinct app for each server, so that each boots its own.
+    def served_app(environ, start_response):
+        return app(environ, start_response)
+
+    capybara.server_name = server_name
+
+    if client == "selenium":
+        session = Session("selenium", served_app)
+        session.visit("/")
+
+        def load():
+            session.visit("/")
+    else:
+        server = Server(served_app).boot()
+        load_with_http(server)
+
+        def load():
+            load_with_http(server)
+
+    start = monotonic()
+    for _ in range(loads):
+        load()
+    return (monotonic() - start) / loads
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--client", choices=["http", "selenium"], default="selenium")
+    parser.add_argument("--loads", type=int, default=50)
+    parser.add_argument("--servers", nargs="+", default=["default", "pooled"])
+    args = parser.parse_args()
+
+    for server_name in args.servers:
+        seconds = benchmark(server_name, args.client, args.loads)
+        print("{0:>10}: {1:.1f} ms per page load".format(server_name, seconds * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+import pytest
+
+from capybara.session import Session
+from capybara.tests.app import app
+from capybara.tests.compat import patch
+
+
+@pytest.fixture
+def retrying_session():
+    session = Session("werkzeug", app)
+    # Retry as a driver for asynchronous pages would.
+    with patch.object(type(session.driver), "is_static", False):
+        yield session
@@ -0,0 +1,142 @@
+import pytest
+from selenium.common.exceptions import WebDriverException
+from threading import Thread
+from time import sleep
+
+from capybara.helpers import Timer
+from capybara.selenium.browser_pool import BrowserPool
+from capybara.tests.compat import NonCallableMock
+
+
+class TestBrowserPool:
+    @pytest.fixture
+    def launched(self):
+        return []
+
+    @pytest.fixture
+    def launch(self, launched):
+        def launch():
+            browser = NonCallableMock(window_handles=["handle"])
+            launched.append(browser)
+            return browser
+
+        return launch
+
+    def wait_for(self, condition):
+        timer = Timer(5)
+        while not condition():
+            assert not timer.expired, "Timed out waiting for the pool"
+            sleep(0.01)
+
+    def test_launches_a_browser_when_none_is_idle(self, launch, launched):
+        pool = BrowserPool()
+        browser = pool.checkout(launch)
+        assert launched == [browser]
+
+    def test_reuses_checked_in_browsers(self, launch, launched):
+        pool = BrowserPool()
+        browser = pool.checkout(launch)
+        pool.checkin(browser)
+        assert pool.checkout(launch) is browser
+        assert len(launched) == 1
+
+    def test_replaces_unhealthy_browsers_on_checkout(self, launch, launched):
+        pool = BrowserPool()
+        browser = pool.checkout(launch)
+        pool.checkin(browser)
+
+        def crashed(browser):
+            raise WebDriverException("browser has crashed")
+
+        type(browser).window_handles = property(crashed)
+
+        assert pool.checkout(launch) is not browser
+        assert len(launched) == 2
+        assert browser.quit.called
+
+    def test_checks_browser_health_without_blocking_the_pool(self, launch, launched):
+        pool = BrowserPool()
+        browser = pool.checkout(launch)
+        pool.checkin(browser)
+        sizes = []
+
+        def window_handles(browser):
+            thread = Thread(target=lambda: sizes.append(pool.size))
+            thread.start()
+            thread.join(1)
+            return ["handle"]
+
+        type(browser).window_handles = property(window_handles)
+
+        assert pool.checkout(launch) is browser
+        assert sizes == [1]
+
+    def test_recycles_browsers_after_max_uses(self, launch, launched):
+        pool = BrowserPool(max_uses=2)
+        browser = pool.checkout(launch)
+        pool.checkin(browser)
+        assert pool.checkout(launch) is browser
+        pool.checkin(browser)
+
+        assert browser.quit.called
+        assert pool.checkout(launch) is not browser
+
+    def test_prelaunches_browsers_in_the_background(self, launch, launched):
+        pool = BrowserPool(min_size=2)
+        pool.checkout(launch)
+        self.wait_for(lambda: len(launched) == 3)
+        self.wait_for(lambda: pool.size == 3)
+
+        pool.checkout(launch)
+        self.wait_for(lambda: len(launched) == 4)
+
+    def test_waits_for_a_browser_when_full(self, launch, launched):
+        pool = BrowserPool(max_size=1)
+        browser = pool.checkout(launch)
+        checked_out = []
+        thread = Thread(target=lambda: checked_out.append(pool.checkout(launch)))
+        thread.start()
+
+        sleep(0.1)
+        assert checked_out == []
+
+        pool.checkin(browser)
+        thread.join(5)
+        assert checked_out == [browser]
+        assert len(launched) == 1
+
+    def test_raises_an_error_when_full_for_too_long(self, launch, launched):
+        pool = BrowserPool(max_size=1, checkout_timeout=0.1)
+        pool.checkout(launch)
+
+        with pytest.raises(RuntimeError) as excinfo:
+            pool.checkout(launch)
+
+        assert "waiting for one of the pool's 1 browsers" in str(excinfo.value)
+        assert len(launched) == 1
+
+    def test_quits_discarded_browsers(self, launch, launched):
+        pool = BrowserPool(max_size=1)
+        browser = pool.checkout(launch)
+        pool.discard(browser)
+
+        assert browser.quit.called
+        assert pool.checkout(launch) is not browser
+
+    def test_quits_idle_browsers(self, launch, launched):
+        pool = BrowserPool()
+        browser = pool.checkout(launch)
+        other_browser = pool.checkout(launch)
+        pool.checkin(browser)
+        pool.quit()
+        assert browser.quit.called
+        assert not other_browser.quit.called
+
+        pool.checkin(other_browser)
+        assert other_browser.quit.called
+
+    def test_quits_checked_out_browsers_at_exit(self, launch, launched):
+        pool = BrowserPool()
+        browser = pool.checkout(launch)
+        pool._quit_at_exit()
+        assert browser.quit.called
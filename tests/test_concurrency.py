@@ -0,0 +1,144 @@
+import pytest
+import sys
+from threading import Thread
+from time import sleep
+
+import capybara
+from capybara.exceptions import SessionsFailed
+from capybara.tests.app import app
+from capybara.tests.compat import patch
+
+
+class TestConcurrentSessions:
+    @pytest.fixture(autouse=True)
+    def setup_capybara(self):
+        original_app = capybara.app
+        original_session_pool = capybara._session_pool
+        capybara.app = app
+        capybara._session_pool = {}
+        try:
+            yield
+        finally:
+            capybara.reset_sessions()
+            capybara.app = original_app
+            capybara._session_pool = original_session_pool
+
+    def run_threads(self, count, target):
+        errors = []
+
+        def run(i):
+            try:
+                target(i)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [Thread(target=run, args=(i,)) for i in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+
+    def test_using_contexts_only_affect_the_current_thread(self):
+        def target(i):
+            with capybara.using_driver("werkzeug"):
+                with capybara.using_session("user{0}".format(i)):
+                    with capybara.using_wait_time(i):
+                        # Give the other threads time to enter their own contexts.
+                        sleep(0.05)
+                        assert capybara.current_driver == "werkzeug"
+                        assert capybara.session_name == "user{0}".format(i)
+                        assert capybara.default_max_wait_time == i
+
+        self.run_threads(8, target)
+
+        assert capybara.current_driver is None
+        assert capybara.session_name == "default"
+        assert capybara.default_max_wait_time == 2
+
+    def test_assignments_without_a_context_set_the_process_wide_default(self):
+        original_default_max_wait_time = capybara.default_max_wait_time
+        try:
+            self.run_threads(1, lambda i: setattr(capybara, "default_max_wait_time", 5))
+            assert capybara.default_max_wait_time == 5
+        finally:
+            capybara.default_max_wait_time = original_default_max_wait_time
+
+    def test_drives_many_sessions_at_once(self):
+        sessions = {}
+
+        def target(i):
+            with capybara.using_driver("werkzeug"):
+                with capybara.using_session("user{0}".format(i)):
+                    for _ in range(10):
+                        session = capybara.current_session()
+                        assert sessions.setdefault(i, session) is session
+                        session.visit("/with_html")
+                        assert session.find("#first").tag_name == "p"
+
+        self.run_threads(16, target)
+
+        assert len(set(sessions.values())) == 16
+
+    def test_runs_functions_against_their_own_sessions(self):
+        def visit(session):
+            assert capybara.current_session() is session
+            assert capybara.current_driver == "werkzeug"
+            assert capybara.default_max_wait_time == 0
+            session.visit("/with_html")
+            return session
+
+        with capybara.using_driver("werkzeug"):
+            with capybara.using_wait_time(0):
+                sessions = capybara.run_sessions(
+                    dict(("user{0}".format(i), visit) for i in range(10)), max_workers=4)
+
+        assert sorted(sessions) == sorted("user{0}".format(i) for i in range(10))
+        assert len(set(sessions.values())) == 10
+        for name, session in sessions.items():
+            with capybara.using_driver("werkzeug"):
+                with capybara.using_session(name):
+                    assert capybara.current_session() is session
+            assert session.current_path == "/with_html"
+
+    def test_collects_errors_for_each_failed_session(self):
+        def visit(session):
+            if session is capybara.current_session() and capybara.session_name == "bob":
+                raise ValueError("bob failed")
+            return capybara.session_name
+
+        with capybara.using_driver("werkzeug"):
+            with pytest.raises(SessionsFailed) as excinfo:
+                capybara.run_sessions({"alice": visit, "bob": visit})
+
+        assert excinfo.value.results == {"alice": "alice"}
+        assert list(excinfo.value.errors) == ["bob"]
+        assert str(excinfo.value.errors["bob"]) == "bob failed"
+
+
+class TestContextLocalModuleProxy:
+    @pytest.fixture
+    def module(self):
+        return capybara._ContextLocalModuleProxy(sys.modules["capybara"])
+
+    def test_looks_up_settings_in_the_current_thread(self, module):
+        with capybara.using_wait_time(5):
+            assert module.default_max_wait_time == 5
+        assert module.default_max_wait_time == 2
+
+    def test_sets_settings_on_the_module(self, module):
+        original_default_max_wait_time = capybara.default_max_wait_time
+        try:
+            module.default_max_wait_time = 5
+            assert capybara.default_max_wait_time == 5
+        finally:
+            capybara.default_max_wait_time = original_default_max_wait_time
+
+    def test_reads_and_writes_other_attributes_on_the_module(self, module):
+        original_app = capybara.app
+        new_app = object()
+        assert module.run_sessions is capybara.run_sessions
+        with patch.object(module, "app", new_app):
+            assert capybara.app is new_app
+        assert capybara.app is original_app
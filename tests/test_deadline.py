@@ -0,0 +1,45 @@
+import pytest
+
+import capybara
+from capybara.exceptions import DeadlineExceeded, ElementNotFound
+from capybara.helpers import monotonic, Timer
+
+
+class TestDeadline:
+    def test_clips_timers_to_the_deadline(self):
+        with capybara.deadline(1):
+            assert Timer(10, clip_to_deadline=True).clipped
+            assert not Timer(0.5, clip_to_deadline=True).clipped
+        assert not Timer(10, clip_to_deadline=True).clipped
+
+    def test_does_not_clip_other_timers(self):
+        with capybara.deadline(1):
+            assert not Timer(10).clipped
+
+    def test_does_not_extend_an_outer_deadline(self):
+        with capybara.deadline(1):
+            with capybara.deadline(10):
+                assert Timer(5, clip_to_deadline=True).clipped
+
+    def test_shares_the_deadline_between_waits(self, retrying_session):
+        retrying_session.visit("/with_html")
+        start = monotonic()
+        with capybara.deadline(0.3):
+            with pytest.raises(DeadlineExceeded) as excinfo:
+                retrying_session.find("css", "#nonexistent", wait=10)
+            with pytest.raises(DeadlineExceeded):
+                retrying_session.find("css", "#nonexistent", wait=10)
+        assert monotonic() - start < 2
+        assert "ran out of time before the deadline" in str(excinfo.value)
+        assert "#nonexistent" in str(excinfo.value)
+
+    def test_raises_the_original_error_within_the_deadline(self, retrying_session):
+        retrying_session.visit("/with_html")
+        with capybara.deadline(10):
+            with pytest.raises(ElementNotFound):
+                retrying_session.find("css", "#nonexistent", wait=0.1)
+
+    def test_allows_successful_calls_after_the_deadline(self, retrying_session):
+        retrying_session.visit("/with_html")
+        with capybara.deadline(0):
+            assert retrying_session.find("css", "#foo")
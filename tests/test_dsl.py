@@ -1,6 +1,9 @@
 import pytest
+from time import sleep
 
 import capybara
+from capybara.tests.app import app
+from capybara.tests.compat import NonCallableMock, patch
 
 
 class DSLTestCase:
@@ -102,6 +105,12 @@ class TestCurrentSession(DSLTestCase):
         assert id(capybara.current_session()) != object_id
         assert capybara.current_session().app == capybara.app
 
+    def test_changes_when_the_session_pool_is_replaced(self):
+        session = capybara.current_session()
+        with patch.object(capybara, "_session_pool", {}):
+            assert capybara.current_session() is not session
+        assert capybara.current_session() is session
+
     def test_changes_when_the_session_name_changes(self):
         object_id = id(capybara.current_session())
         capybara.session_name = "administrator"
@@ -112,6 +121,28 @@ class TestCurrentSession(DSLTestCase):
         assert id(capybara.current_session()) == object_id
 
 
+class TestDSLMethods(DSLTestCase):
+    @pytest.fixture(autouse=True)
+    def setup_app(self):
+        capybara.app = app
+
+    def test_calls_node_methods_within_the_current_scope(self):
+        import capybara.dsl as dsl
+
+        dsl.visit("/with_html")
+        assert dsl.has_css("#foo")
+        with dsl.scope("css", "#second"):
+            assert not dsl.has_css("#foo")
+
+    def test_follows_session_changes(self):
+        import capybara.dsl as dsl
+
+        dsl.visit("/with_html")
+        with capybara.using_session("other"):
+            assert not dsl.has_css("#foo")
+        assert dsl.has_css("#foo")
+
+
 class TestUsingSession(DSLTestCase):
     def test_changes_the_session_name_for_the_duration_of_the_block(self):
         assert capybara.session_name == "default"
@@ -139,3 +170,66 @@ class TestUsingSession(DSLTestCase):
 class TestSessionName(DSLTestCase):
     def test_defaults_to_default(self):
         assert capybara.session_name == "default"
+
+
+class TestResetSessions(DSLTestCase):
+    @pytest.fixture(autouse=True)
+    def setup_sessions(self):
+        with patch.object(capybara, "_session_pool", {}):
+            capybara.app = app
+            yield
+
+    @pytest.fixture
+    def resets(self):
+        resets = []
+
+        def reset(driver):
+            sleep(0.1)
+            resets.append(driver)
+
+        with patch.object(type(capybara.current_session().driver), "reset", reset):
+            yield resets
+
+    def test_resets_only_used_sessions(self, resets):
+        used_session = capybara.current_session()
+        with capybara.using_session("unused"):
+            unused_session = capybara.current_session()
+        driver = used_session.driver
+        used_session.visit("/with_html")
+
+        capybara.reset_sessions()
+        assert resets == [driver]
+        assert not unused_session.dirty
+
+        capybara.reset_sessions()
+        assert len(resets) == 1
+
+    def test_resets_sessions_lazily(self, resets):
+        session = capybara.current_session()
+        session.visit("/with_html")
+
+        with patch.object(capybara, "lazy_reset", True):
+            capybara.reset_sessions()
+        assert resets == []
+        assert not session.dirty
+
+        session.visit("/with_html")
+        assert len(resets) == 1
+        assert session.dirty
+
+    def test_raises_server_errors_before_resetting_sessions_lazily(self, resets):
+        session = capybara.current_session()
+        session.visit("/with_html")
+        server = NonCallableMock(error=RuntimeError("app failed"))
+
+        with patch.object(session, "server", server):
+            with patch.object(capybara, "lazy_reset", True):
+                with pytest.raises(RuntimeError) as excinfo:
+                    capybara.reset_sessions()
+            assert str(excinfo.value) == "app failed"
+            server.wait_for_pending_requests.assert_called_once_with()
+            server.reset_error.assert_called_once_with()
+
+        # The driver is still reset in the background.
+        session.visit("/with_html")
+        assert len(resets) == 1
@@ -141,3 +141,49 @@ def test_provides_a_page_fixture(testdir):
     """)
     result = testdir.runpytest()
     result.assert_outcomes(passed=1)
+
+
+def test_limits_waiting_to_the_deadline_when_marked(testdir):
+    testdir.makepyfile("""
+        import capybara
+        import pytest
+        from capybara.exceptions import DeadlineExceeded
+        from capybara.helpers import Timer
+
+        @pytest.mark.deadline(1)
+        def test_clips_timers_to_the_deadline():
+            assert Timer(10, clip_to_deadline=True).clipped
+            assert not Timer(0.5, clip_to_deadline=True).clipped
+
+        def test_does_not_clip_timers_when_unmarked():
+            assert not Timer(10, clip_to_deadline=True).clipped
+    """)
+    result = testdir.runpytest()
+    result.assert_outcomes(passed=2)
+
+
+def test_attaches_server_stats_to_slow_test_reports(testdir):
+    testdir.makepyfile("""
+        from contextlib import closing
+        from time import sleep
+
+        from capybara.compat import urlopen
+        from capybara.server import Server
+        import test_app
+
+        def test_is_slow():
+            server = Server(test_app.app).boot()
+            with closing(urlopen("http://{}:{}/a".format(server.host, server.port))) as response:
+                response.read()
+            sleep(0.2)
+            assert False
+
+        def test_is_fast():
+            assert False
+    """)
+    result = testdir.runpytest("--capybara-server-stats=0.1")
+    result.assert_outcomes(failed=2)
+    result.stdout.fnmatch_lines([
+        "*Captured server stats*",
+        "GET /a: 1 requests, mean * ms, max * ms, 6 bytes, statuses 200 x1"])
+    assert result.stdout.str().count("Captured server stats") == 1
@@ -29,3 +29,16 @@ class TestResult:
         assert result[1] == children[1]
         assert result[2] == children[2]
         assert result[3] == children[3]
+
+    def test_is_truthy_when_it_has_elements(self, result):
+        assert result
+
+    def test_is_falsy_when_no_elements_match(self, children, query):
+        query.matches_filters.return_value = False
+        assert not Result(children, query)
+
+    def test_only_filters_as_many_elements_as_needed(self, result, children, query):
+        assert result[1] == children[1]
+        assert query.matches_filters.call_count == 2
+        assert len(result) == 4
+        assert query.matches_filters.call_count == 4
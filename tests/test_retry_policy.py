@@ -0,0 +1,76 @@
+import pytest
+
+import capybara
+from capybara.exceptions import ElementNotFound
+from capybara.retry_policy import ExponentialRetryPolicy, FixedRetryPolicy, JitteredRetryPolicy
+from capybara.session import Session
+from capybara.tests.app import app
+
+
+class TestFixedRetryPolicy:
+    def test_waits_the_same_interval_before_every_retry(self):
+        policy = FixedRetryPolicy(0.1)
+        assert [policy.delay(retry) for retry in range(1, 4)] == [0.1, 0.1, 0.1]
+
+
+class TestExponentialRetryPolicy:
+    def test_grows_the_wait_up_to_the_maximum(self):
+        policy = ExponentialRetryPolicy(initial=0.05, factor=2, maximum=0.3)
+        assert [policy.delay(retry) for retry in range(1, 6)] == [0.05, 0.1, 0.2, 0.3, 0.3]
+
+    def test_handles_many_retries(self):
+        policy = ExponentialRetryPolicy(initial=0.05, factor=2, maximum=1)
+        assert policy.delay(100000) == 1
+
+
+class TestJitteredRetryPolicy:
+    def test_shortens_the_wait_by_up_to_half(self):
+        policy = JitteredRetryPolicy(initial=0.05, factor=2, maximum=0.4)
+        for retry in range(1, 6):
+            expected = min(0.05 * 2 ** (retry - 1), 0.4)
+            assert expected / 2 <= policy.delay(retry) <= expected
+
+
+class TestSynchronizeRetryPolicy:
+    @pytest.fixture
+    def policy(self):
+        return FixedRetryPolicy(0.05)
+
+    def test_records_retries_per_call(self, retrying_session, policy):
+        retrying_session.visit("/with_html")
+        with capybara.using_retry_policy(policy):
+            retrying_session.find("css", "#foo")
+            with pytest.raises(ElementNotFound):
+                retrying_session.find("css", "#nonexistent", wait=0.2)
+
+        counts = policy.retry_counts
+        assert counts[0] == 1
+        assert sum(counts.values()) == 2
+        assert 2 <= max(counts) <= 4
+
+    def test_uses_the_retry_policy_given_to_synchronize(self, retrying_session, policy):
+        retrying_session.visit("/with_html")
+        calls = []
+
+        @retrying_session.document.synchronize(wait=0.2, retry_policy=policy)
+        def find():
+            calls.append(True)
+            if len(calls) < 3:
+                raise ElementNotFound("not yet")
+
+        find()
+        assert policy.retry_counts == {2: 1}
+
+    def test_clears_retry_counts(self, policy):
+        policy.record(3)
+        policy.clear_retry_counts()
+        assert policy.retry_counts == {}
+
+    def test_does_not_retry_on_static_drivers(self, policy):
+        session = Session("werkzeug", app)
+        session.visit("/with_html")
+        with capybara.using_retry_policy(policy):
+            with pytest.raises(ElementNotFound):
+                session.find("css", "#nonexistent", wait=10)
+
+        assert policy.retry_counts == {0: 1}
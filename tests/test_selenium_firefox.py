@@ -3,6 +3,7 @@ from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
 
 import capybara
 from capybara.session import Session
+from capybara.selenium.browser_pool import BrowserPool
 from capybara.selenium.driver import Driver
 from capybara.tests.app import app
 from capybara.tests.suite import DriverSuite
@@ -31,6 +32,54 @@ def init_selenium_firefox_clear_storage_driver(app):
         desired_capabilities=capabilities)
 
 
+@capybara.register_driver("selenium_firefox_intercept_modals")
+def init_selenium_firefox_intercept_modals_driver(app):
+    return Driver(
+        app,
+        browser="firefox",
+        desired_capabilities=capabilities,
+        modal_detection="intercept")
+
+
+@capybara.register_driver("selenium_firefox_no_page_load_wait")
+def init_selenium_firefox_no_page_load_wait_driver(app):
+    return Driver(
+        app,
+        browser="firefox",
+        desired_capabilities=capabilities,
+        page_load_strategy="none")
+
+
+@capybara.register_driver("selenium_firefox_launch_in_background")
+def init_selenium_firefox_launch_in_background_driver(app):
+    return Driver(
+        app,
+        browser="firefox",
+        desired_capabilities=capabilities,
+        launch_in_background=True)
+
+
+@capybara.register_driver("selenium_firefox_wait_for_mutations")
+def init_selenium_firefox_wait_for_mutations_driver(app):
+    return Driver(
+        app,
+        browser="firefox",
+        desired_capabilities=capabilities,
+        wait_strategy="mutation")
+
+
+browser_pool = BrowserPool(max_uses=10)
+
+
+@capybara.register_driver("selenium_firefox_pooled")
+def init_selenium_firefox_pooled_driver(app):
+    return Driver(
+        app,
+        browser="firefox",
+        browser_pool=browser_pool,
+        desired_capabilities=capabilities)
+
+
 SeleniumFirefoxDriverSuite = DriverSuite("selenium_firefox", skip=["fullscreen"])
 
 
@@ -58,3 +107,70 @@ class TestSeleniumFirefox:
         session.visit("/with_js")
         assert session.evaluate_script("window.localStorage.length") == 0
         assert session.evaluate_script("window.sessionStorage.length") == 0
+
+    def test_intercepts_prompts_with_a_response(self):
+        session = Session("selenium_firefox_intercept_modals", app)
+        session.visit("/with_js")
+        with session.accept_prompt("Prompt opened", response="the response"):
+            session.click_link("Open prompt")
+        assert session.has_xpath("//a[@id='open-prompt' and @response='the response']")
+
+    def test_intercepts_nested_confirms(self):
+        session = Session("selenium_firefox_intercept_modals", app)
+        session.visit("/with_js")
+        with session.dismiss_confirm("Are you really sure?"):
+            with session.accept_confirm("Are you sure?"):
+                session.click_link("Open check twice")
+        assert session.has_xpath("//a[@id='open-twice' and @confirmed='false']")
+
+    def test_intercepts_asynchronous_alerts(self):
+        session = Session("selenium_firefox_intercept_modals", app)
+        session.visit("/with_js")
+        with session.accept_alert("Delayed alert opened"):
+            session.click_link("Open delayed alert")
+        assert session.has_xpath("//a[@id='open-delayed-alert' and @opened='true']")
+
+    def test_reuses_pooled_browsers_across_sessions(self):
+        session = Session("selenium_firefox_pooled", app)
+        session.visit("/with_js")
+        browser = session.driver.browser
+        session.reset()
+
+        other_session = Session("selenium_firefox_pooled", app)
+        other_session.visit("/with_js")
+        assert other_session.driver.browser is browser
+        other_session.reset()
+
+    def test_reset_records_the_time_spent_in_each_phase(self):
+        session = Session("selenium_firefox", app)
+        session.visit("/with_js")
+        session.open_new_window()
+        session.reset()
+        assert set(session.driver.reset_timings) == {"cookies", "storage", "navigation", "windows"}
+        assert len(session.driver.window_handles) == 1
+
+    def test_waits_for_the_next_page_when_not_blocking_on_page_loads(self):
+        session = Session("selenium_firefox_no_page_load_wait", app)
+        session.visit("/with_js")
+        session.visit("/with_html")
+        assert session.find("css", "#foo").text
+        assert session.has_current_path("/with_html")
+
+    def test_raises_an_error_for_an_invalid_page_load_strategy(self):
+        with pytest.raises(AssertionError) as excinfo:
+            Driver(app, page_load_strategy="lazy")
+        assert "invalid option 'lazy' for page_load_strategy" in str(excinfo.value)
+
+    def test_launches_the_browser_while_the_server_boots(self):
+        session = Session("selenium_firefox_launch_in_background", app)
+        assert session.driver._background_launch is not None
+        session.visit("/with_html")
+        assert session.has_selector("css", "#foo")
+        session.reset()
+
+    def test_waits_for_dom_mutations_before_retrying(self):
+        session = Session("selenium_firefox_wait_for_mutations", app)
+        session.visit("/with_js")
+        session.click_link("Click me")
+        assert session.find("css", "a#has-been-clicked").text == "Has been clicked"
+        assert session.has_no_selector("css", "#change")
@@ -1,12 +1,22 @@
 from contextlib import closing
+import gc
+from gzip import GzipFile
+from io import BytesIO
+import os
 import pytest
 import socket
+import threading
+from threading import Thread
 from time import sleep
+import weakref
 
 import capybara
-from capybara.compat import urlopen
-from capybara.server import Server
-from capybara.utils import Counter, decode_bytes, encode_string
+from capybara.compat import HTTPConnection, URLError, urlopen, urlparse
+from capybara.helpers import monotonic, Timer
+from capybara.server import Middleware, Server
+from capybara.session import Session
+from capybara.tests.compat import patch
+from capybara.utils import Counter, bind_socket, decode_bytes, encode_string
 
 
 class TestServer:
@@ -108,3 +118,471 @@ class TestServer:
         assert counter.value == 0
 
         s.close()
+
+    def test_reports_hung_requests_by_path(self):
+        def app(environ, start_response):
+            sleep(0.5)
+            start_response("200 OK", [])
+            return [encode_string("Hello Server!")]
+
+        server = Server(app).boot()
+
+        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        s.connect((server.host, server.port))
+        s.send(encode_string("GET /hung HTTP/1.0\r\n\r\n"))
+        sleep(0.1)
+
+        [(request, seconds)] = server.pending_requests
+        assert request == "GET /hung"
+        assert seconds > 0
+
+        with pytest.raises(RuntimeError) as excinfo:
+            server.wait_for_pending_requests(timeout=0.1)
+        assert "GET /hung" in str(excinfo.value)
+
+        server.wait_for_pending_requests()
+        assert server.pending_requests == []
+
+        s.close()
+
+    def test_lets_sessions_wait_for_the_network_to_become_idle(self):
+        def app(environ, start_response):
+            sleep(0.3)
+            start_response("200 OK", [])
+            return [encode_string("Hello Server!")]
+
+        session = Session("werkzeug", app)
+        session.server = Server(app).boot()
+
+        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        s.connect((session.server.host, session.server.port))
+        s.send(encode_string("GET / HTTP/1.0\r\n\r\n"))
+        sleep(0.1)
+
+        with patch("capybara.session.sleep") as sleep_:
+            assert session._wait_for_network_idle(0, Timer(5))
+        assert not session.server.has_pending_requests
+        # The server's requests are waited for without polling.
+        assert not sleep_.called
+
+        s.close()
+
+    def test_reuses_a_booted_server_without_requesting_it(self, app):
+        server1 = Server(app).boot()
+        with patch("capybara.server.urlopen") as urlopen_:
+            server2 = Server(app).boot()
+
+        assert not urlopen_.called
+        assert server2.port == server1.port
+        assert server2.middleware is server1.middleware
+
+    def test_serves_a_prebound_socket(self, app):
+        sockets = []
+
+        def init_prebound_server(app, port, host, socket=None, ready=None):
+            sockets.append(socket)
+            capybara.servers["werkzeug"](app, port, host, socket=socket, ready=ready)
+
+        with patch.dict(capybara.servers):
+            capybara.register_server("prebound", accepts_socket=True)(init_prebound_server)
+            with patch.object(capybara, "server_name", "prebound"):
+                server = Server(app).boot()
+
+        assert sockets[0].getsockname()[1] == server.port
+        with closing(urlopen("http://{}:{}".format(server.host, server.port))) as response:
+            assert "Hello Server" in decode_bytes(response.read())
+
+    def test_polls_servers_that_do_not_accept_a_socket(self, app):
+        def init_unbound_server(app, port, host):
+            capybara.servers["werkzeug"](app, port, host)
+
+        with patch.dict(capybara.servers):
+            capybara.register_server("unbound")(init_unbound_server)
+            with patch.object(capybara, "server_name", "unbound"):
+                server = Server(app).boot()
+
+        with closing(urlopen("http://{}:{}".format(server.host, server.port))) as response:
+            assert "Hello Server" in decode_bytes(response.read())
+
+    def test_raises_if_the_server_stops_during_boot(self, app):
+        def init_broken_server(app, port, host, socket=None, ready=None):
+            pass
+
+        with patch.dict(capybara.servers):
+            capybara.register_server("broken", accepts_socket=True)(init_broken_server)
+            with patch.object(capybara, "server_name", "broken"):
+                with pytest.raises(RuntimeError) as excinfo:
+                    Server(app).boot()
+        assert "stopped during boot" in str(excinfo.value)
+
+    def test_pooled_server_keeps_connections_alive(self):
+        def app(environ, start_response):
+            body = encode_string("Hello Pooled Server!")
+            start_response("200 OK", [("Content-Length", str(len(body)))])
+            return [body]
+
+        with patch.object(capybara, "server_name", "pooled"):
+            server = Server(app).boot()
+
+        connection = HTTPConnection(server.host, server.port)
+        try:
+            connection.request("GET", "/")
+            assert "Hello Pooled Server" in decode_bytes(connection.getresponse().read())
+            sock = connection.sock
+
+            connection.request("GET", "/")
+            assert "Hello Pooled Server" in decode_bytes(connection.getresponse().read())
+            assert connection.sock is sock
+        finally:
+            connection.close()
+
+    def test_pooled_server_handles_more_connections_than_threads(self):
+        def app(environ, start_response):
+            sleep(0.1)
+            start_response("200 OK", [("Connection", "close")])
+            return [encode_string("Hello Pooled Server!")]
+
+        bodies = []
+
+        def fetch(url):
+            with closing(urlopen(url)) as response:
+                bodies.append(decode_bytes(response.read()))
+
+        with patch.object(capybara, "server_threads", 2):
+            with patch.object(capybara, "server_name", "pooled"):
+                server = Server(app).boot()
+
+        url = "http://{}:{}".format(server.host, server.port)
+        threads = [Thread(target=fetch, args=(url,)) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        assert len(bodies) == 5
+
+    def test_shuts_down_and_releases_the_port(self, app):
+        server = Server(app).boot()
+        port = server.port
+        server.shutdown()
+
+        assert not server.running
+        assert server not in Server.registry.servers
+        with pytest.raises(URLError):
+            urlopen("http://{}:{}".format(server.host, port))
+        bind_socket(server.host, port).close()
+
+    def test_restarts_on_the_same_port(self, app):
+        server = Server(app).boot()
+        port = server.port
+        server.shutdown()
+        server.boot()
+
+        assert server.port == port
+        with closing(urlopen("http://{}:{}".format(server.host, port))) as response:
+            assert "Hello Server" in decode_bytes(response.read())
+
+    def test_shuts_down_when_used_as_a_context_manager(self, app):
+        with Server(app) as server:
+            with closing(urlopen("http://{}:{}".format(server.host, server.port))) as response:
+                assert "Hello Server" in decode_bytes(response.read())
+
+        assert not server.running
+
+    def test_waits_for_pending_requests_before_shutting_down(self):
+        def app(environ, start_response):
+            sleep(0.2)
+            start_response("200 OK", [])
+            return [encode_string("Hello Server!")]
+
+        server = Server(app).boot()
+        bodies = []
+
+        def fetch():
+            with closing(urlopen("http://{}:{}".format(server.host, server.port))) as response:
+                bodies.append(decode_bytes(response.read()))
+
+        thread = Thread(target=fetch)
+        thread.start()
+        sleep(0.1)
+        server.shutdown()
+        thread.join(5)
+
+        assert bodies == ["Hello Server!"]
+
+    def test_shuts_down_idle_servers(self, app):
+        def slow_app(environ, start_response):
+            sleep(0.3)
+            start_response("200 OK", [])
+            return [encode_string("Hello Slow Server!")]
+
+        idle_server = Server(app).boot()
+        busy_server = Server(slow_app).boot()
+
+        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        s.connect((busy_server.host, busy_server.port))
+        s.send(encode_string("GET / HTTP/1.0\r\n\r\n"))
+        sleep(0.1)
+
+        stopped = Server.registry.shutdown_idle()
+        assert idle_server in stopped
+        assert busy_server not in stopped
+        assert not idle_server.running
+        assert busy_server.running
+
+        busy_server.shutdown()
+        s.close()
+
+    def test_pooled_server_closes_kept_alive_connections_on_shutdown(self):
+        def app(environ, start_response):
+            body = encode_string("Hello Pooled Server!")
+            start_response("200 OK", [("Content-Length", str(len(body)))])
+            return [body]
+
+        with patch.object(capybara, "server_name", "pooled"):
+            server = Server(app).boot()
+
+        connection = HTTPConnection(server.host, server.port)
+        try:
+            connection.request("GET", "/")
+            connection.getresponse().read()
+
+            start = monotonic()
+            server.shutdown()
+            assert monotonic() - start < 1
+            assert not server.running
+        finally:
+            connection.close()
+
+    def test_releases_threads_and_memory_across_boots(self):
+        def cycle():
+            def app(environ, start_response):
+                start_response("200 OK", [])
+                return [encode_string("Hello Server!")]
+
+            with Server(app) as server:
+                with closing(urlopen("http://{}:{}".format(server.host, server.port))) as response:
+                    response.read()
+            return weakref.ref(app)
+
+        cycle()
+        gc.collect()
+        threads = threading.active_count()
+        apps = [cycle() for _ in range(1000)]
+        gc.collect()
+
+        assert threading.active_count() <= threads
+        assert not any(app() for app in apps)
+
+    def test_collects_request_stats(self):
+        def app(environ, start_response):
+            if environ["PATH_INFO"] == "/missing":
+                start_response("404 Not Found", [])
+                return [encode_string("Not Found")]
+            start_response("200 OK", [])
+            return [encode_string("Hello Server!")]
+
+        server = Server(app).boot()
+        url = "http://{}:{}".format(server.host, server.port)
+        for _ in range(2):
+            with closing(urlopen(url + "/")) as response:
+                response.read()
+        with pytest.raises(URLError):
+            urlopen(url + "/missing")
+
+        timer = Timer(5)
+        while sum(stats["count"] for stats in server.stats().values()) < 3:
+            assert not timer.expired, "Timed out waiting for the stats"
+            sleep(0.01)
+
+        stats = server.stats()
+        assert stats["GET /"]["count"] == 2
+        assert stats["GET /"]["size"] == 2 * len("Hello Server!")
+        assert stats["GET /"]["statuses"] == {200: 2}
+        assert sum(stats["GET /"]["histogram"]) == 2
+        assert stats["GET /"]["max_seconds"] <= stats["GET /"]["seconds"]
+        assert stats["GET /missing"]["statuses"] == {404: 1}
+
+        server.reset_stats()
+        assert server.stats() == {}
+
+
+class TestCounter:
+    def test_returns_immediately_when_zero(self):
+        assert Counter().wait_for_zero(timeout=0)
+
+    def test_times_out_while_held(self):
+        counter = Counter()
+        with counter:
+            assert not counter.wait_for_zero(timeout=0.05)
+        assert counter.wait_for_zero(timeout=0)
+
+    def test_wakes_when_the_count_drops_to_zero(self):
+        counter = Counter()
+        counter.__enter__()
+        thread = Thread(target=lambda: (sleep(0.1), counter.__exit__(None, None, None)))
+        thread.start()
+        start = monotonic()
+        assert counter.wait_for_zero(timeout=5)
+        assert monotonic() - start < 1
+        thread.join()
+
+
+class TestStaticAssets:
+    @pytest.fixture
+    def directory(self, tmpdir):
+        tmpdir.join("app.js").write("var greeting = 'Hello Static Assets!';\n" * 20)
+        tmpdir.join("logo.png").write_binary(b"\x89PNG" + b"\x00" * 512)
+        return str(tmpdir)
+
+    @pytest.fixture
+    def calls(self):
+        return []
+
+    @pytest.fixture
+    def middleware(self, directory, calls):
+        def app(environ, start_response):
+            calls.append(environ["PATH_INFO"])
+            start_response("200 OK", [])
+            return [encode_string("Hello App!")]
+
+        return Middleware(app, static_paths={"/static": directory})
+
+    def request(self, middleware, path, **environ):
+        response = {}
+
+        def start_response(status, headers):
+            response["status"] = status
+            response["headers"] = dict(headers)
+
+        environ.setdefault("REQUEST_METHOD", "GET")
+        environ["PATH_INFO"] = path
+        response["body"] = b"".join(middleware(environ, start_response))
+        return response
+
+    def test_serves_assets_without_calling_the_app(self, middleware, calls):
+        response = self.request(middleware, "/static/logo.png")
+        assert response["status"] == "200 OK"
+        assert response["headers"]["Content-Type"] == "image/png"
+        assert response["body"].startswith(b"\x89PNG")
+        assert calls == []
+
+    def test_passes_other_requests_to_the_app(self, middleware, calls):
+        assert self.request(middleware, "/static/missing.png")["body"] == b"Hello App!"
+        assert self.request(middleware, "/static/../app.js")["body"] == b"Hello App!"
+        assert self.request(middleware, "/static/logo.png", REQUEST_METHOD="POST")["body"] == \
+            b"Hello App!"
+        assert self.request(middleware, "/other")["body"] == b"Hello App!"
+        assert calls == ["/static/missing.png", "/static/../app.js", "/static/logo.png", "/other"]
+
+    def test_responds_not_modified_to_matching_etags(self, middleware):
+        etag = self.request(middleware, "/static/logo.png")["headers"]["ETag"]
+        response = self.request(middleware, "/static/logo.png", HTTP_IF_NONE_MATCH=etag)
+        assert response["status"] == "304 Not Modified"
+        assert response["body"] == b""
+
+    def test_serves_gzipped_copies_when_accepted(self, middleware):
+        plain = self.request(middleware, "/static/app.js")
+        gzipped = self.request(middleware, "/static/app.js", HTTP_ACCEPT_ENCODING="gzip, deflate")
+
+        assert "Content-Encoding" not in plain["headers"]
+        assert gzipped["headers"]["Content-Encoding"] == "gzip"
+        assert len(gzipped["body"]) < len(plain["body"])
+        assert GzipFile(fileobj=BytesIO(gzipped["body"])).read() == plain["body"]
+
+        image = self.request(middleware, "/static/logo.png", HTTP_ACCEPT_ENCODING="gzip")
+        assert "Content-Encoding" not in image["headers"]
+
+    def test_reloads_changed_assets(self, middleware, directory):
+        etag = self.request(middleware, "/static/app.js")["headers"]["ETag"]
+
+        path = os.path.join(directory, "app.js")
+        with open(path, "w") as f:
+            f.write("var greeting = 'Hello Again!';")
+        os.utime(path, (0, 0))
+
+        response = self.request(middleware, "/static/app.js")
+        assert response["headers"]["ETag"] != etag
+        assert response["body"] == b"var greeting = 'Hello Again!';"
+
+    def test_counts_asset_requests(self, middleware):
+        values = []
+        middleware.static_assets._load = lambda filename: values.append(middleware.counter.value)
+
+        self.request(middleware, "/static/logo.png")
+        assert values == [1]
+        assert middleware.counter.value == 0
+
+
+class TestRouting:
+    @pytest.fixture(autouse=True, params=["host", "path"])
+    def routing(self, request):
+        with patch.object(capybara, "server_routing", request.param):
+            yield request.param
+
+    def make_app(self, greeting):
+        def app(environ, start_response):
+            start_response("200 OK", [])
+            return [encode_string("{0} from {1}{2}".format(
+                greeting, environ.get("SCRIPT_NAME", ""), environ["PATH_INFO"]))]
+
+        return app
+
+    def fetch(self, server, path, url=None):
+        url = urlparse(url or server.url)
+        connection = HTTPConnection(server.host, server.port)
+        try:
+            # Send the host name in the URL, without relying on it resolving.
+            connection.request("GET", url.path + path, headers={"Host": url.netloc})
+            return decode_bytes(connection.getresponse().read())
+        finally:
+            connection.close()
+
+    def test_serves_many_apps_from_one_server(self, routing):
+        server1 = Server(self.make_app("Hello")).boot()
+        server2 = Server(self.make_app("Howdy")).boot()
+
+        assert server1.port == server2.port
+        assert server1.server_thread is server2.server_thread
+        assert server1.url != server2.url
+        assert self.fetch(server1, "/foo").startswith("Hello from ")
+        assert self.fetch(server2, "/foo").startswith("Howdy from ")
+
+    def test_mounts_apps_under_a_path_prefix(self, routing):
+        server = Server(self.make_app("Hello")).boot()
+        if routing == "path":
+            assert self.fetch(server, "/foo") == "Hello from /{0}/foo".format(server.mount)
+        else:
+            assert self.fetch(server, "/foo") == "Hello from /foo"
+
+    def test_serves_apps_on_subdomains_of_the_routing_domain(self, routing):
+        with patch.object(capybara, "server_routing_domain", "example.test"):
+            server = Server(self.make_app("Hello")).boot()
+        if routing == "host":
+            assert urlparse(server.url).hostname == "{0}.example.test".format(server.mount)
+        assert self.fetch(server, "/foo").startswith("Hello from ")
+
+    def test_unmounts_apps_on_shutdown(self, routing):
+        server = Server(self.make_app("Hello")).boot()
+        other_server = Server(self.make_app("Howdy")).boot()
+        url = server.url
+        server.shutdown()
+
+        assert other_server.running
+        assert self.fetch(other_server, "/", url=url) == "No app is mounted here."
+
+    def test_visits_urls_on_the_mounted_app(self):
+        session = Session("werkzeug", self.make_app("Hello"))
+        session.server = Server(session.app).boot()
+        with patch.object(session.driver, "visit") as visit:
+            session.visit("/foo?bar=baz")
+        visit.assert_called_once_with(session.server.url + "/foo?bar=baz")
+
+    def test_reports_paths_within_the_mounted_app(self):
+        session = Session("werkzeug", self.make_app("Hello"))
+        session.server = Server(session.app).boot()
+        current_url = property(lambda session: session.server.url + "/foo?bar=baz")
+        with patch.object(Session, "current_url", current_url):
+            assert session.current_path == "/foo"
+            assert session.has_current_path("/foo?bar=baz")
+            assert session.assert_current_path("/foo", only_path=True)